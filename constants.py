@@ -12,6 +12,7 @@ VIEW = "View all job applications"
 QUIT = "Quit"
 BKP = "Start Backup Daemon"
 PRT = "Print to file"
+STATS = "View application stats"
 
 CHOICE_MAP = {
     "Automatically generate entry from url (beta)": "auto",
@@ -21,12 +22,24 @@ CHOICE_MAP = {
     "Quit": "quit",
     "Start Backup Daemon": "bkp",
     "Print to file": "print",
+    "View application stats": "stats",
 }
 
 ##### File Constants #####
 SOURCE_CSV = f"{PROJECT_ROOT}/job_applications.csv"
 COLUMN_NAMES = ["Company", "Position", "Date Applied", "Status", "Portal Link", "Notes"]
 
+##### Store Constants #####
+STORAGE_BACKEND = os.getenv("TRAPP_STORAGE", "columnar")  # "columnar" or "sqlite"
+STORE_DIR = f"{PROJECT_ROOT}/.store"
+STORE_SNAPSHOT = f"{STORE_DIR}/job_applications.pkl"
+STORE_LOG = f"{STORE_DIR}/job_applications.log"
+STORE_DB = f"{STORE_DIR}/job_applications.db"
+STORE_LOCK = f"{STORE_DIR}/job_applications.lock"
+STORE_SORT_INDEX = f"{STORE_DIR}/job_applications.idx"
+STORE_COMPACT_THRESHOLD = 500  # Change log records before compaction
+STORE_LOCK_TIMEOUT = 30  # Seconds to wait for another process's write
+
 ##### Input Constants #####
 INPUT_COMPANY_NAME = "Input company name"
 INPUT_POSITION = "Input position"
@@ -36,6 +49,18 @@ INPUT_NOTES = "Input notes"
 INPUT_JOB_POSTING_URL = "Enter upto 5 comma separated urls."
 INPUT_QUIT = "Type Q to quit."
 INPUT_MASS_ADD = "Type M for > 5 urls."
+INPUT_SEARCH = "Search entries by company, position, date or status."
+
+##### Search Constants #####
+SEARCH_LIMIT = 20
+SEARCH_AGAIN = "Search again"
+
+##### Stats Constants #####
+STATS_LIMIT = 10  # Rows per table in the stats report
+
+##### Dedup Constants #####
+DUPLICATE_LINK = "portal link already tracked"
+DUPLICATE_ENTRY = "company and position already tracked"
 
 ##### Status Constants #####
 STATUS_INIT = "Applied"
@@ -50,6 +75,8 @@ DATE_CUSTOM = "Custom"
 
 ##### Flag Constants #####
 BKP_FLAG = "wbkp"
+STATS_FLAG = "stats"
+EXPORT_FORMATS = ["csv", "tsv", "json"]
 
 ##### Default Choices #####
 DEFAULT_COLUMN_CHOOSE = "Default"
@@ -68,6 +95,9 @@ GUM_CHOOSE = [f"{GUM_PATH}", "choose"]
 GUM_INPUT_W_PLACEHOLDER = [f"{GUM_PATH}", "input", "--placeholder"]
 GUM_FILTER = [f"{GUM_PATH}", "filter", "--fuzzy", "--no-limit", "--sort"]
 
+# Prompt backend: "gum" spawns the gum binary per prompt, "rich" asks in-process
+PROMPT_BACKEND = os.getenv("TRAPP_PROMPT", "gum")
+
 # BAT = "./bin/bat/bat"
 BAT = "bat"
 
@@ -76,6 +106,9 @@ NY = ["NO", "YES"]
 
 ##### Display Constants #####
 MAX_COL_WIDTH = 40
+VIEW_PAGE_SIZE = 50  # Rows per page when streaming large histories
+VIEW_MORE = "Show more"
+VIEW_DONE = "Done"
 
 #### Platform Constants ####
 PLATFORM_MAP = {
@@ -87,6 +120,10 @@ PLATFORM_MAP = {
 #### Auth Constants ####
 VAULT_PATH = f"{PROJECT_ROOT}/.vault"
 
+#### Coordination Constants ####
+# "local" coordinates threads in one process, "redis" is needed across processes
+COORDINATION_BACKEND = os.getenv("TRAPP_COORDINATION", "local")
+
 #### Redis Constants ####
 REDIS_HOST = "localhost"
 REDIS_PORT = 6379
@@ -98,7 +135,12 @@ REDIS_TEST_PWD = "test"
 REDIS_CHARSET = "utf-8"
 REDIS_ERRORS = "strict"
 REDIS_LOG_FILE = f"{PROJECT_ROOT}/logs/redis.log"
-REDIS_STATUS_TMP = f"{PROJECT_ROOT}/logs/redis_status.tmp"
+REDIS_STATUS_TTL = 2  # Seconds a PING health check result is reused
+REDIS_PING_TIMEOUT = 1  # Seconds before a health check PING gives up
+REDIS_POOL_SIZE = 20  # Two per worker: one for commands, one for lock pub/sub
+REDIS_POOL_TIMEOUT = 20  # Seconds to wait for a free pooled connection
+REDIS_LOCK_TTL = 300  # Seconds, long enough for a manual login
+REDIS_LOCK_RETRY = 0.05  # Seconds between attempts when no lease is visible
 
 #### Chrome Driver Constants ####
 CHROME_DRIVER_VERSIONS_JSON = "https://googlechromelabs.github.io/chrome-for-testing/known-good-versions-with-downloads.json"
@@ -127,12 +169,36 @@ CHROME_DRIVER_COOKIE_DIR = f"{PROJECT_ROOT}/.cache/chrome_driver_<platform>"
 #### Selenium Constants ####
 SELENIUM_TIMEOUT = 5
 
+#### HTTP Constants ####
+HTTP_CLIENT_OPTS = {
+    "timeout": SELENIUM_TIMEOUT,
+    "follow_redirects": True,
+    "headers": {
+        "User-Agent": "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36",
+        "Accept": "text/html,application/xhtml+xml",
+    },
+}
+
 #### Vault Constants ####
 VAULT_PATH = f"{PROJECT_ROOT}/.vault"
 
 #### Multiprocessing Constants ####
 MAX_WORKERS = 10
 
+#### Batch Engine Constants ####
+BATCH_ENGINE = os.getenv("TRAPP_BATCH_ENGINE", "thread")  # "thread" or "async"
+ASYNC_HOST_CONCURRENCY = 4  # Concurrent HTTP requests per host
+ASYNC_BROWSER_WORKERS = 3  # Threads for browser bound work
+
+#### Scrape Cache Constants ####
+SCRAPE_CACHE_PATH = f"{PROJECT_ROOT}/.cache/scrape_cache.json"
+SCRAPE_CACHE_TTL = 7 * 24 * 60 * 60  # One week, in seconds
+SCRAPE_CACHE_MAX_ENTRIES = 5000
+
+#### Driver Pool Constants ####
+DRIVER_POOL_SIZE = MAX_WORKERS
+DRIVER_POOL_MAX_USES = 25
+
 #### Logging Constants ####
 LOG_FILENAME = f"{PROJECT_ROOT}/logs/trapp.log"
 LOG_THREADED_FILENAME = f"{PROJECT_ROOT}/logs/trapp-threaded.log"
@@ -144,6 +210,27 @@ LOG_DATEFMT = "%Y-%m-%d %H:%M:%S"
 #### xvfb Constants ####
 XVFB_CACHE_FLAG = f"{PROJECT_ROOT}/.cache/xvfb"
 
+#### Shared Display Constants ####
+XVFB_PATH = "Xvfb"
+DISPLAY_STATE_PATH = f"{PROJECT_ROOT}/.cache/display.json"
+DISPLAY_LOCK_PATH = f"{PROJECT_ROOT}/.cache/display.lock"
+DISPLAY_SIZE = (800, 600)
+DISPLAY_START_TIMEOUT = 10  # Seconds to wait for Xvfb to accept connections
+X11_SOCKET_DIR = "/tmp/.X11-unix"  # Holds the X<n> socket of display :<n>
+DISPLAY_PROBE_TIMEOUT = 1  # Seconds to wait for a reused display to accept a connection
+# Keep the display running after the last client leaves, for the next run
+DISPLAY_KEEP_WARM = os.getenv("TRAPP_DISPLAY_KEEP_WARM", "1") == "1"
+
+#### Scrape Daemon Constants ####
+DAEMON_SOCKET_PATH = f"{PROJECT_ROOT}/.cache/trapp.sock"
+DAEMON_CONNECT_TIMEOUT = 1  # Seconds to wait for the daemon to accept a client
+DAEMON_FLAG = "daemon"
+
+#### Capability Cache Constants ####
+CAPABILITY_CACHE_PATH = f"{PROJECT_ROOT}/.cache/capabilities.json"
+# Environment variables that change what has_gui() and verify_headless_support() find
+CAPABILITY_ENV = ["DISPLAY", "WAYLAND_DISPLAY", "XDG_SESSION_TYPE", "XDG_CURRENT_DESKTOP", "PATH"]
+
 #### Formula configuration ####
 FORMULA_CONFIG_PATH = f"{PROJECT_ROOT}/infra/build/config/formula.json"
 FORMULA_PATH = f"{PROJECT_ROOT}/infra/build/formula/out"
@@ -1,15 +1,13 @@
+import argparse
+import atexit
 import constants
 import os
-import pandas as pd
-import subprocess
 import sys
-import validators
 
 
 from datetime import *
-from rich.console import Console
-from scripts.models import entry, status
-from scripts.services.auto import AutoService
+from scripts.models import status
+from scripts.services.store import LazyStore
 from scripts.utils.process import SubprocessService
 from scripts.utils.gum import Gum
 from scripts.utils.helpers import (
@@ -22,18 +20,22 @@ from scripts.utils.helpers import (
 global bkp_flag
 bkp_flag = False
 
+# Job application store behind constants.SOURCE_CSV, built on first use
+store = LazyStore()
+
+# Heavy modules (pandas, selenium, redis, ...) are imported inside the menu
+# actions that need them, so startup and Quit stay fast. tests/test_startup.py
+# keeps runner.py within its import time budget.
+
 
 def main():
-    # Set pandas config to print columns with max width
-    pd.set_option("display.max_colwidth", constants.MAX_COL_WIDTH)
     # Check if source CSV file exists
-    if os.path.isfile(constants.SOURCE_CSV) == False:
+    if not store.exists():
         print(
             "Source CSV file does not exist. Creating new file named job_applications.csv..."
         )
         try:
-            df = pd.DataFrame(columns=constants.COLUMN_NAMES)
-            df.to_csv(constants.SOURCE_CSV, index=False)
+            store.init()
         except Exception as e:
             print(e)
             return
@@ -49,6 +51,7 @@ def main():
                 constants.ADD,
                 constants.EDIT,
                 constants.PRT,
+                constants.STATS,
                 constants.AUTO,
                 constants.QUIT,
             ]
@@ -58,6 +61,7 @@ def main():
                 constants.ADD,
                 constants.EDIT,
                 constants.PRT,
+                constants.STATS,
                 constants.QUIT,
             ]
         )
@@ -79,21 +83,22 @@ def menu_choice(choice):
         "bkp": bkp,
         "auto": auto,
         "print": print_to_file,
+        "stats": stats,
     }
     func = switcher.get(choice, lambda: "Invalid choice")
     return func
 
 
 def view():
-    if os.path.isfile(constants.SOURCE_CSV) == False:
+    if not store.exists():
         print("Source CSV file does not exist. Please add a job entry first.")
         return
-    df = pd.read_csv(constants.SOURCE_CSV)
     # Ask user if they want to sort by column
     print("Do you want to sort output by a column?")
     print(f"Possible columns: {[*constants.COLUMN_NAMES]}")
 
     sort_choice = Gum.choose([*constants.NY])
+    sort_column = None
     # Have a default sort option
     if sort_choice == "YES":
         print(
@@ -101,13 +106,41 @@ def view():
         )
         choices = constants.COLUMN_NAMES
         sort_column = Gum.choose([*choices])
-        # Sort dataframe
-        df = df.sort_values(by=[sort_column])
-    # Print dataframe
-    file_preview(df)
+    # Stream large histories page by page
+    if store.count() > constants.VIEW_PAGE_SIZE:
+        stream_view(sort_column)
+        return
+    # Print dataframe, sorted through the store's sort index
+    pages = store.iter_pages(constants.VIEW_PAGE_SIZE, sort_by=sort_column)
+    page = next(pages, None)
+    # An empty store has no pages, show its empty table
+    file_preview(store.load() if page is None else page)
+
+
+def stream_view(sort_column=None):
+    # Show the first page immediately, load the next one on demand
+    total = store.count()
+    shown = 0
+    for page in store.iter_pages(constants.VIEW_PAGE_SIZE, sort_by=sort_column):
+        print(
+            page.to_string(
+                header=True, index=False, max_colwidth=constants.MAX_COL_WIDTH
+            )
+        )
+        shown += len(page.index)
+        print(
+            f"{constants.INFOBLUE}Showing {shown} of {total} entries{constants.ENDC}"
+        )
+        if shown >= total:
+            break
+        if Gum.choose([constants.VIEW_MORE, constants.VIEW_DONE]) != constants.VIEW_MORE:
+            break
 
 
 def add():
+    import validators
+    from scripts.models import entry
+
     print("Adding new job application...")
     # Ask user for company name
     company_name = Gum.input(placeholder=constants.INPUT_COMPANY_NAME)
@@ -159,123 +192,73 @@ def add():
         notes=notes,
     )
     df = new_entry.create_dataframe()
-    # Append dataframe to CSV
-    df.to_csv(constants.SOURCE_CSV, mode="a", header=False, index=False)
+    # Append dataframe to store, unless it is already tracked
+    if not append_new_entries(df):
+        return
     print("Job entry added!")
 
 
 def edit():
     # Make sure job_applications.csv exists
-    if os.path.isfile(constants.SOURCE_CSV) == False:
+    if not store.exists():
         print("Source CSV file does not exist. Please add a job entry first.")
         return
+    from scripts.utils.search import FuzzyIndex
+
+    # Build fuzzy search index over loaded entries
+    index = FuzzyIndex(store.load())
+    terminal_width = get_terminal_width()
+    if terminal_width == None:
+        terminal_width = 80
     success_flag = True
-    check_out = constants.DEFAULT_COLUMN_CHOOSE
     while success_flag:
-        # Ask user to choose job entry
-        column = subprocess.Popen(
-            ["column", "-s,", "-t", f"{constants.SOURCE_CSV}"],
-            stdout=subprocess.PIPE,
-            shell=False,
-        )
-        less = subprocess.Popen(
-            ["less", "-#2", "-N", "-S"], stdin=column.stdout, stdout=subprocess.PIPE
-        )
-        column.stdout.close()
-        gum = subprocess.Popen(
-            [*constants.GUM_FILTER], stdin=less.stdout, stdout=subprocess.PIPE
+        # Ask user to search for job entry
+        query = Gum.input(
+            placeholder=f"{constants.INPUT_SEARCH} {constants.INPUT_QUIT}"
         )
-        less.stdout.close()
-        output = gum.communicate()[0].decode("utf-8")
-        echo_output = subprocess.Popen(["echo", f"{output}"], stdout=subprocess.PIPE)
-        awk_check = subprocess.Popen(
-            ["awk", "-F", "[[:space:]][[:space:]]+", "{print $1}"],
-            stdin=echo_output.stdout,
-            stdout=subprocess.PIPE,
-        )
-        echo_output.stdout.close()
-        check_out = awk_check.communicate()[0].decode("utf-8").strip()
-        if check_out == "Company":
-            print(f"{constants.FAIL}You cannot edit a column header!{constants.ENDC}")
-            print("Do you want to try again?")
-            retry_choice = Gum.choose([*constants.YN])
-            if retry_choice == "YES":
-                continue
-            else:
-                return
-        elif check_out == constants.DEFAULT_COLUMN_CHOOSE:
-            print(f"{constants.FAIL}No entry was chosen!{constants.ENDC}")
-            continue
-        elif check_out is None:
-            print(f"{constants.FAIL}No entry was chosen!{constants.ENDC}")
+        if query == "Q":
+            return
+        row_ids = index.search(query, limit=constants.SEARCH_LIMIT)
+        if not row_ids:
+            print(f"{constants.FAIL}No entries found!{constants.ENDC}")
             continue
-        else:
-            success_flag = False
-    # Get rows that match check_out
-    df = pd.read_csv(constants.SOURCE_CSV)
-    original_df = df.copy()
-    # Get original index of matching rows
-    df = df.loc[df[constants.COLUMN_NAMES[0]] == check_out]
-    original_index = df.index.values[0]
-    print(
-        f"{constants.OKGREEN}Here are the entries that match your search:{constants.ENDC}"
-    )
-    # If there are multiple rows, ask user to choose one
-    if len(df.index) > 1:
-        print(df)
+        # Ask user to choose one entry, keyed by row id
         print(
-            f"{constants.WARNING}Multiple entries found. Please choose one:{constants.ENDC}"
-        )
-        terminal_width = get_terminal_width()
-        if terminal_width == None:
-            terminal_width = 80
-        # Ask user to choose one row (show complete row)
-        dup_companies = []
-        for row in df.values.tolist():
-            row_str = "\t".join(row[:4])
-            trunc_row_str = row_str[:terminal_width]
-            dup_companies.append(trunc_row_str)
-        company_row = subprocess.Popen(
-            [*constants.GUM_CHOOSE] + dup_companies, stdout=subprocess.PIPE, shell=False
-        )
-        position = subprocess.Popen(
-            ["awk", "-F", "\t", "{print $2}"],
-            stdin=company_row.stdout,
-            stdout=subprocess.PIPE,
+            f"{constants.OKGREEN}Here are the entries that match your search:{constants.ENDC}"
         )
-        company_row.stdout.close()
-        position_output = position.communicate()[0].decode("utf-8").strip()
-        intermidiate_index = df.index[df["Position"] == position_output].tolist()[0]
-        df = df.loc[df["Position"] == position_output]
-        original_index = original_index + intermidiate_index - 1
-    elif len(df.index) == 0:
-        print(f"{constants.FAIL}No entries found!{constants.ENDC}")
-        return
+        matches = {
+            f"{row_id}  {index.label(row_id)}"[:terminal_width]: row_id
+            for row_id in row_ids
+        }
+        choice = Gum.choose([*matches, constants.SEARCH_AGAIN])
+        if choice == constants.SEARCH_AGAIN or choice not in matches:
+            continue
+        row_id = matches[choice]
+        success_flag = False
+    df = store.get(row_id).to_frame().T
     old_df = df.copy()
     # Ask user if they want to update or delete the entry
     print("What do you want to do?")
     update_choice = Gum.choose(["Update", "Delete"])
     if update_choice == "Update":
-        update(df, original_df, original_index, old_df)
+        update(df, row_id, old_df)
     elif update_choice == "Delete":
-        delete(df, original_df, original_index)
+        delete(df, row_id)
 
 
-def delete(df, original_df, original_index):
+def delete(df, row_id):
     print("Confirm deletion?")
     delete_choice = Gum.choose([*constants.YN])
     if delete_choice == "YES":
-        # Delete row from dataframe
-        original_df = original_df.drop(original_index)
-        # Write to CSV
-        original_df.to_csv(constants.SOURCE_CSV, index=False)
+        # Delete row from store
+        store.delete(row_id)
         print("Entry deleted!")
         print(df)
     else:
         print("Deletion not confirmed. Exiting...")
 
 
-def update(df, original_df, original_index, old_df):
+def update(df, row_id, old_df):
     # Ask user if they want to update the status or any other column
     print("What do you want to update?")
     update_choice = Gum.choose(["Status", "Other"])
@@ -305,10 +288,9 @@ def update(df, original_df, original_index, old_df):
     # Confirm changes
     print("Confirm changes?")
     confirm_choice = Gum.choose([*constants.YN])
-    if confirm_choice == "Yes":
-        # Update CSV
-        original_df.loc[original_index] = df.iloc[0]
-        original_df.to_csv(constants.SOURCE_CSV, index=False)
+    if confirm_choice == "YES":
+        # Update row in store
+        store.update(row_id, df.iloc[0].to_dict())
         print("Entry updated!")
     else:
         print("Changes not saved.")
@@ -329,16 +311,31 @@ def bkp():
 
 
 def print_to_file():
-    if os.path.isfile(constants.SOURCE_CSV) == False:
+    if not store.exists():
         print("Source CSV file does not exist. Please add a job entry first.")
         return
-    df = pd.read_csv(constants.SOURCE_CSV)
+    df = store.load()
     print("Printing to file...")
     file_preview(df, ptf_flag=True)
 
 
+def stats():
+    if not store.exists():
+        print("Source CSV file does not exist. Please add a job entry first.")
+        return
+    # Aggregates are kept up to date by the store, no full read needed
+    print("===== Application Stats =====")
+    print(store.stats().report())
+
+
 def auto():
-    service = AutoService()  # Initialize AutoService
+    import validators
+    from rich.console import Console
+    from scripts.models import entry
+    from scripts.services.daemon import DaemonClient
+    from scripts.utils.errors import DaemonError, ServiceNotRunningError
+
+    service = scrape_service()
     # Ask user for job posting URL
     success_flag = True
     while success_flag:
@@ -360,11 +357,11 @@ def auto():
         success_flag = False
         print(f"{constants.OKGREEN}Cooking...{constants.ENDC}", end=" ")
         Console().print(":man_cook:")
-        dfs = []
+        entries = []
         while True:
             try:
-                df, failed_urls = service.batch_run(urls)
-                dfs.append(df)
+                results, failed_urls = service.batch_run(urls)
+                entries.extend(results)
                 if failed_urls:
                     print_tabbed_doc_string(
                         f"{constants.PROJECT_ROOT}/docs/shell/scrape_fail.txt"
@@ -374,13 +371,55 @@ def auto():
                     if retry_choice == "YES":
                         urls = failed_urls
                         continue
-                if df.empty:
+                if not entries:
+                    return
+                break
+            except DaemonError as e:
+                # The job failed inside the daemon, keep what was scraped before it
+                print(e)
+                if not entries:
                     return
                 break
+            except ServiceNotRunningError as e:
+                if not isinstance(service, DaemonClient):
+                    print(e)
+                    return
+                # The daemon went away between jobs, scrape in this process instead
+                from scripts.services.auto import AutoService
+
+                print(f"{e}, scraping without it")
+                service = AutoService()
             except Exception as e:
                 print(e)
                 return
-        finish_auto_service(pd.concat(dfs, ignore_index=True))
+        finish_auto_service(entry.Entry.to_frame(entries))
+
+
+def scrape_service():
+    """
+    @return: Client of a running trapp daemon, or else a new in-process AutoService
+    """
+    from scripts.services.daemon import DaemonClient
+
+    client = DaemonClient()
+    if client.available():
+        print("Using trapp daemon")
+        return client
+    from scripts.services.auto import AutoService
+
+    return AutoService()
+
+
+def flush_store():
+    """
+    Export this run's changes to the CSV file before exiting
+    """
+    from scripts.utils.errors import StoreConflictError
+
+    try:
+        store.flush()
+    except StoreConflictError as e:
+        print(f"{constants.FAIL}{e}{constants.ENDC}")
 
 
 def quit():
@@ -396,8 +435,9 @@ def finish_auto_service(df):
     print("Does this look correct? Confirming will write entry to file.")
     confirm_choice = Gum.choose([*constants.YN])
     if confirm_choice == "YES":
-        # Append to CSV
-        df.to_csv(constants.SOURCE_CSV, mode="a", header=False, index=False)
+        # Append to store, skipping entries that are already tracked
+        if not append_new_entries(df):
+            return
         print("Entry written to file!")
     else:
         print(
@@ -405,9 +445,187 @@ def finish_auto_service(df):
         )
 
 
+def append_new_entries(df):
+    # Append entries unless their portal link or company and position are
+    # already tracked. The store checks and writes under one lock, so
+    # concurrent trapp processes can't both add the same posting.
+    row_ids, reasons = store.append_new(df)
+    for (_, row), reason in zip(df.iterrows(), reasons):
+        if reason:
+            print(
+                f"[{constants.WARNING}SKIPPED{constants.ENDC}]: {row['Company']} - {row['Position']} ({reason})"
+            )
+    return row_ids
+
+
+def write_entries(df):
+    # Append entries to store without prompting, skipping tracked ones
+    if not store.exists():
+        store.init()
+    row_ids = append_new_entries(df)
+    if not row_ids:
+        print(f"{constants.WARNING}No new entries to write.{constants.ENDC}")
+        return
+    print(f"{constants.OKGREEN}{len(row_ids)} entry(s) written to file!{constants.ENDC}")
+
+
+def cli_add(args):
+    import validators
+    from scripts.models import entry
+
+    if not validators.url(args.link):
+        sys.exit(f"Invalid URL: {args.link}")
+    new_entry = entry.Entry(
+        company=args.company,
+        position=args.position,
+        date_applied=datetime.strptime(args.date, "%m/%d/%Y") if args.date else date.today(),
+        status=status.Status(args.status),
+        link=args.link,
+        notes=args.notes,
+    )
+    write_entries(new_entry.create_dataframe())
+
+
+def cli_auto(args):
+    import validators
+    from scripts.models import entry
+
+    # Read URLs, one per line or comma separated, skipping comments
+    with open(args.urls_file) if args.urls_file != "-" else sys.stdin as urls_file:
+        urls = [
+            url.strip()
+            for line in urls_file
+            if not line.lstrip().startswith("#")
+            for url in line.split(",")
+            if url.strip()
+        ]
+    invalid = [url for url in urls if not validators.url(url)]
+    for url in invalid:
+        print(f"[{constants.FAIL}ERROR{constants.ENDC}]: Invalid URL: {url}")
+    urls = [url for url in urls if url not in invalid]
+    if not urls:
+        sys.exit("No valid URLs found.")
+    service = scrape_service()
+    entries = []
+    for _ in range(args.retries + 1):
+        results, urls = service.batch_run(urls, engine=args.engine)
+        entries.extend(results)
+        if not urls:
+            break
+    if entries:
+        write_entries(entry.Entry.to_frame(entries))
+    if urls:
+        sys.exit(f"{len(urls)} URL(s) failed after {args.retries} retry(s).")
+
+
+def cli_export(args):
+    from scripts.models import schema
+
+    if not store.exists():
+        sys.exit("Source CSV file does not exist. Please add a job entry first.")
+    df = schema.format_frame(store.load())
+    output = args.output or sys.stdout
+    if args.format == "csv":
+        df.to_csv(output, index=False)
+    elif args.format == "tsv":
+        df.to_csv(output, index=False, sep="\t")
+    elif args.format == "json":
+        df.to_json(output, orient="records", indent=2)
+        if output is sys.stdout:
+            print()
+
+
+def cli_daemon(args):
+    from scripts.services.daemon import DaemonClient, TrappDaemon
+
+    client = DaemonClient()
+    if args.stop:
+        if not client.available():
+            sys.exit("trapp daemon is not running.")
+        client.shutdown()
+        print("trapp daemon stopped.")
+    elif args.status:
+        if not client.available():
+            sys.exit("trapp daemon is not running.")
+        print(f"trapp daemon running, pid {client.request('ping')['pid']}")
+    else:
+        TrappDaemon().serve()
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(
+        prog="trapp",
+        description="Track your job applications. Runs the interactive menu when no command is given.",
+    )
+    parser.add_argument(
+        "--prompt",
+        choices=[*Gum.backends],
+        help=f"Prompt backend, defaults to $TRAPP_PROMPT or {constants.PROMPT_BACKEND}",
+    )
+    commands = parser.add_subparsers(dest="command")
+    add_parser = commands.add_parser("add", help="Add a job application")
+    add_parser.add_argument("--company", required=True)
+    add_parser.add_argument("--position", required=True)
+    add_parser.add_argument("--link", required=True, help="Portal link")
+    add_parser.add_argument("--date", help="Date applied (MM/DD/YYYY), defaults to today")
+    add_parser.add_argument(
+        "--status",
+        default=status.Status.INIT.value,
+        choices=[s.value for s in status.Status],
+    )
+    add_parser.add_argument("--notes", default="")
+    auto_parser = commands.add_parser(
+        "auto", help="Generate job applications from job posting URLs"
+    )
+    auto_parser.add_argument(
+        "--urls-file",
+        required=True,
+        help="File with one URL per line (or comma separated), - for stdin",
+    )
+    auto_parser.add_argument(
+        "--retries", type=int, default=0, help="Times to retry failed URLs"
+    )
+    auto_parser.add_argument(
+        "--engine", default=constants.BATCH_ENGINE, choices=["thread", "async"]
+    )
+    export_parser = commands.add_parser("export", help="Export job applications")
+    export_parser.add_argument(
+        "--format", default="csv", choices=constants.EXPORT_FORMATS
+    )
+    export_parser.add_argument("--output", help="File to write, defaults to stdout")
+    commands.add_parser(constants.STATS_FLAG, help="Show application stats")
+    daemon_parser = commands.add_parser(
+        constants.DAEMON_FLAG,
+        help="Run the scrape daemon, which auto commands use while it is running",
+    )
+    daemon_action = daemon_parser.add_mutually_exclusive_group()
+    daemon_action.add_argument(
+        "--stop", action="store_true", help="Stop the running daemon"
+    )
+    daemon_action.add_argument(
+        "--status", action="store_true", help="Check if the daemon is running"
+    )
+    commands.add_parser(constants.BKP_FLAG, help="Run with the backup daemon")
+    return parser.parse_args(argv)
+
+
 if __name__ == "__main__":
+    args = parse_args(sys.argv[1:])
+    atexit.register(flush_store)
+    if args.prompt:
+        Gum.use(args.prompt)
     # Check if bkp flag is set
-    if len(sys.argv) > 1:
-        if sys.argv[1] == constants.BKP_FLAG:
-            bkp_flag = True
+    if args.command == constants.BKP_FLAG:
+        bkp_flag = True
+    # Run non-interactive commands without any prompts
+    commands = {
+        "add": cli_add,
+        "auto": cli_auto,
+        "export": cli_export,
+        constants.STATS_FLAG: lambda _: stats(),
+        constants.DAEMON_FLAG: cli_daemon,
+    }
+    if args.command in commands:
+        commands[args.command](args)
+        sys.exit(0)
     main()
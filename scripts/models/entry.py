@@ -6,6 +6,8 @@ from . import status
 
 
 class Entry:
+    __slots__ = ("company", "position", "date_applied", "status", "link", "notes")
+
     def __init__(
         self,
         company: str,
@@ -23,16 +25,35 @@ class Entry:
         self.notes = notes
 
     def create_dataframe(self) -> pd.DataFrame:
+        return Entry.to_frame([self])
+
+    def to_record(self) -> tuple:
+        """
+        @return: Validated entry values, in constants.COLUMN_NAMES order
+        """
         self.validate()
-        df_dict = {key: None for key in constants.COLUMN_NAMES}
-        df_dict["Company"] = self.company
-        df_dict["Position"] = self.position
-        df_dict["Date Applied"] = self.date_applied
-        df_dict["Status"] = self.status
-        df_dict["Portal Link"] = self.link
-        df_dict["Notes"] = self.notes
-        df = pd.DataFrame(df_dict, index=[0])
-        return df
+        return (
+            self.company,
+            self.position,
+            self.date_applied,
+            self.status,
+            self.link,
+            self.notes,
+        )
+
+    @staticmethod
+    def to_frame(entries: list["Entry"]) -> pd.DataFrame:
+        """
+        Build a single DataFrame from many entries, one column list at a time
+
+        @param entries: Entries to convert
+        @return: Pandas DataFrame with one row per entry
+        """
+        columns = zip(*[entry.to_record() for entry in entries])
+        data = dict(zip(constants.COLUMN_NAMES, map(list, columns)))
+        return pd.DataFrame(
+            {column: data.get(column, []) for column in constants.COLUMN_NAMES}
+        )
 
     def validate(self):
         assert self.status in status.Status
@@ -1,10 +1,16 @@
 import abc
 import constants
+import httpx
 import pickle
-import time
 
 from pathlib import Path
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.support.wait import WebDriverWait
+from selenium.webdriver.support.expected_conditions import (
+    presence_of_element_located,
+)
 from scripts.utils.errors import NoDriverSetError, AutoServiceError
+from scripts.utils.timer import PhaseTimer
 
 
 class Platform:
@@ -14,12 +20,22 @@ class Platform:
 
     __metaclass__ = abc.ABCMeta
 
+    # Locators (By, selector) whose presence signals the base URL and the job
+    # URL are ready. When unset, the document ready state is used instead.
+    base_ready = None
+    page_ready = None
+
+    # Platforms whose job posts can be read from static HTML opt in to the
+    # HTTP fast path, which skips Chrome entirely.
+    http_only = False
+
     def __init__(self, url: str):
         self.url = url
         self.clean_url()
         self.driver = None
         self.auth_driver = None
         self.curr_driver = None
+        self.pooled = False
 
     @property
     def name(self):
@@ -51,6 +67,12 @@ class Platform:
         """
         raise NotImplementedError
 
+    def parse(self, html: str) -> tuple[str, str, str, str]:
+        """
+        Parse job post from static HTML for <platform> (HTTP fast path only)
+        """
+        raise NotImplementedError
+
     @abc.abstractclassmethod
     def clean_url(self):
         """
@@ -65,11 +87,13 @@ class Platform:
         """
         raise NotImplementedError
 
-    def set_driver(self, driver):
+    def set_driver(self, driver, pooled: bool = False):
         """
-        Set driver for platform
+        Set driver for platform. Pooled drivers are reset and reused by
+        their pool instead of being closed after scraping.
         """
         self.driver = driver
+        self.pooled = pooled
 
     def set_auth_driver(self, driver):
         """
@@ -104,26 +128,85 @@ class Platform:
             self.clean()
             self.set_curr_driver(self.driver)  # Set current driver as main driver
 
-    def scrape_wrapper(self):
+    def scrape_wrapper(self, timer: PhaseTimer = None):
         """
         Setup scrape
+
+        @param timer: Optional timer to record the duration of each phase in
         """
+        timer = timer or PhaseTimer()
         self.init()  # Init platform
         self.set_curr_driver(self.driver)  # Set current driver as main driver
         # Load cookies
-        self.go_to_base_url()
-        time.sleep(constants.SELENIUM_TIMEOUT)
-        self.load_cookies()  # Load cookies
-        self.go_to_url()
-        time.sleep(constants.SELENIUM_TIMEOUT)
+        with timer.phase("base_load"):
+            self.go_to_base_url()
+        with timer.phase("base_ready", baseline=constants.SELENIUM_TIMEOUT):
+            self.wait_until_ready(self.base_ready)
+        with timer.phase("cookies"):
+            self.load_cookies()  # Load cookies
+        with timer.phase("page_load"):
+            self.go_to_url()
+        with timer.phase("page_ready", baseline=constants.SELENIUM_TIMEOUT):
+            self.wait_until_ready(self.page_ready)
         try:
-            res = self.scrape()  # Scrape
+            with timer.phase("scrape"):
+                res = self.scrape()  # Scrape
         except Exception as e:
             self.clean()
-            raise AutoServiceError(f"Scraping {self.url} failed", e, self.url)
+            raise AutoServiceError(f"Scraping {self.url} failed", e, self.url) from e
         self.clean()
         return res
 
+    def fetch(self, client: httpx.Client = None) -> str:
+        """
+        Fetch job post HTML without a browser
+
+        @param client: Optional shared HTTP client
+        @return: HTML of the job post
+        """
+        if not client:
+            with httpx.Client(**constants.HTTP_CLIENT_OPTS) as client:
+                return self.fetch(client)
+        response = client.get(self.url)
+        response.raise_for_status()
+        return response.text
+
+    def fetch_wrapper(self, client: httpx.Client = None, timer: PhaseTimer = None):
+        """
+        HTTP fast path counterpart of scrape_wrapper
+
+        @param client: Optional shared HTTP client
+        @param timer: Optional timer to record the duration of each phase in
+        """
+        timer = timer or PhaseTimer()
+        try:
+            with timer.phase("fetch"):
+                html = self.fetch(client)
+            with timer.phase("parse"):
+                return self.parse(html)
+        except Exception as e:
+            raise AutoServiceError(f"Scraping {self.url} failed", e, self.url) from e
+
+    def wait_until_ready(self, locator: tuple[str, str] = None) -> bool:
+        """
+        Wait until the current page is ready, instead of sleeping for a fixed time
+
+        @param locator: Locator of an element that signals readiness
+        @return: True if the page became ready before the timeout, False otherwise
+        """
+        wait = WebDriverWait(self.curr_driver, constants.SELENIUM_TIMEOUT)
+        try:
+            if locator:
+                wait.until(presence_of_element_located(locator))
+            else:
+                wait.until(
+                    lambda driver: driver.execute_script("return document.readyState")
+                    == "complete"
+                )
+        except TimeoutException:
+            return False  # Let scrape() surface the actual page state
+        return True
+
     def retrieve_auth_state(self):
         """
         Gets cookies and saves them to disk
@@ -182,8 +265,10 @@ class Platform:
 
     def clean(self):
         """
-        Kill current driver
+        Kill current driver, unless it is leased from a driver pool
         """
+        if self.pooled and self.curr_driver is self.driver:
+            return
         self.curr_driver.close()
 
     def non_headed_auth_instruction(self):
@@ -0,0 +1,237 @@
+import constants
+import datetime
+import pandas as pd
+import sys
+
+from . import status
+
+# Print job applications with capped column widths
+pd.set_option("display.max_colwidth", constants.MAX_COL_WIDTH)
+
+# Status is one of a handful of values, ordered along the application funnel
+STATUS_DTYPE = pd.CategoricalDtype(categories=[s.value for s in status.Status])
+DATE_FORMAT = "%m/%d/%Y"
+
+DTYPES = {
+    "Company": object,  # Interned, see intern()
+    "Position": object,
+    "Date Applied": "datetime64[ns]",
+    "Status": STATUS_DTYPE,
+    "Portal Link": object,
+    "Notes": object,
+}
+
+
+def read_csv(path: str) -> pd.DataFrame:
+    """
+    Read a job applications CSV file into the typed schema
+
+    @param path: Path of the CSV file
+    @return: Typed Pandas DataFrame
+    """
+    return apply(pd.read_csv(path, dtype=str, keep_default_na=False, na_values=[""]))
+
+
+def apply(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Convert job applications with raw string values to the typed schema.
+    Values the schema doesn't know are kept as entered, see statuses() and
+    parse_dates().
+
+    @param df: Job applications, as read from CSV or a store
+    @return: Typed copy of df, with the same index
+    """
+    df = df.reindex(columns=constants.COLUMN_NAMES)
+    return df.assign(
+        **{
+            "Company": intern(df["Company"]),
+            "Date Applied": parse_dates(df["Date Applied"]),
+            "Status": statuses(df["Status"]),
+        }
+    ).astype({"Position": object, "Portal Link": object, "Notes": object})
+
+
+def concat(df: pd.DataFrame, rows: pd.DataFrame) -> pd.DataFrame:
+    """
+    Append typed rows to typed job applications, merging their statuses
+    """
+    if not len(df.index):
+        return rows
+    df = pd.concat([df, rows])
+    if not isinstance(df["Status"].dtype, pd.CategoricalDtype):
+        # Status categories differed, so pandas fell back to object
+        df["Status"] = statuses(df["Status"])
+    return df
+
+
+def intern(column: pd.Series) -> pd.Series:
+    """
+    Intern repeated strings so equal values share one object
+    """
+    return column.map(lambda v: sys.intern(v) if isinstance(v, str) else v).astype(
+        object
+    )
+
+
+def statuses(column: pd.Series) -> pd.Series:
+    """
+    Convert a status column to categorical. Statuses entered through "Other"
+    become extra categories after the known ones.
+    """
+    known = list(STATUS_DTYPE.categories)
+    extra = [v for v in column.dropna().unique() if v not in known]
+    if not extra:
+        return column.astype(STATUS_DTYPE)
+    return column.astype(object).astype(
+        pd.CategoricalDtype(categories=known + sorted(extra, key=str))
+    )
+
+
+def parse_dates(column: pd.Series) -> pd.Series:
+    """
+    Parse dates stored as DATE_FORMAT, falling back to pandas' own parser
+    for dates entered in another format. Dates neither understands are kept
+    as entered, next to the parsed ones in an object column.
+    """
+    if pd.api.types.is_datetime64_any_dtype(column):
+        return column
+    # Applications share few distinct dates, so parse each one only once
+    codes, uniques = pd.factorize(column)
+    uniques = pd.Series(uniques, dtype=object)
+    dates = pd.to_datetime(uniques, format=DATE_FORMAT, errors="coerce")
+    unparsed = dates.isna()
+    if unparsed.any():
+        dates[unparsed] = pd.to_datetime(
+            uniques[unparsed], format="mixed", errors="coerce"
+        )
+    raw = dates.isna() & uniques.map(lambda v: isinstance(v, str) and bool(v.strip()))
+    if raw.any():
+        dates = dates.astype(object)
+        dates[raw] = uniques[raw]
+    dates = pd.concat([dates, pd.Series([pd.NaT], dtype=dates.dtype)])
+    return pd.Series(dates.values[codes], index=column.index, name=column.name)
+
+
+def parse_date(value):
+    """
+    Parse a single date like parse_dates(), with a fast path for DATE_FORMAT
+
+    @return: Timestamp, NaT for blank values, or the value as entered
+    """
+    if isinstance(value, (datetime.date, pd.Timestamp)):
+        return pd.Timestamp(value)
+    if not isinstance(value, str):
+        return pd.NaT if is_missing(value) else value
+    try:
+        return pd.Timestamp(datetime.datetime.strptime(value, DATE_FORMAT))
+    except ValueError:
+        return parse_dates(pd.Series([value], dtype=object)).iloc[0]
+
+
+def sort_key(column: pd.Series) -> pd.Series:
+    """
+    @return: column in a form that sorts, with dates kept as entered last
+    """
+    if column.dtype == object and DTYPES.get(column.name) == "datetime64[ns]":
+        return pd.Series(
+            [v if isinstance(v, (datetime.date, pd.Timestamp)) else pd.NaT for v in column],
+            index=column.index,
+            dtype="datetime64[ns]",
+        )
+    return column
+
+
+def check_values(values: dict) -> dict:
+    """
+    Reject values of a single job application that can't be stored
+
+    @raise ValueError: For unknown columns and values that aren't scalars
+    @return: values
+    """
+    unknown = [column for column in values if column not in constants.COLUMN_NAMES]
+    if unknown:
+        raise ValueError(f"Unknown column(s): {', '.join(map(str, unknown))}")
+    for column, value in values.items():
+        if not pd.api.types.is_scalar(value):
+            raise ValueError(f"{column} must be a single value, got {value!r}")
+    return values
+
+
+def parse_values(values: dict) -> dict:
+    """
+    Convert raw values of a single job application to the typed schema
+    """
+    values = dict(values)
+    if values.get("Date Applied") is not None:
+        values["Date Applied"] = parse_date(values["Date Applied"])
+    if isinstance(values.get("Company"), str):
+        values["Company"] = sys.intern(values["Company"])
+    return values
+
+
+def set_value(df: pd.DataFrame, row_id: int, column: str, value) -> None:
+    """
+    Set one typed value in place, widening the column if it can't hold it
+    """
+    dtype = df[column].dtype
+    if (
+        isinstance(dtype, pd.CategoricalDtype)
+        and not is_missing(value)
+        and value not in dtype.categories
+    ):
+        df[column] = df[column].cat.add_categories([value])
+    elif pd.api.types.is_datetime64_any_dtype(dtype) and isinstance(value, str):
+        df[column] = df[column].astype(object)
+    df.at[row_id, column] = value
+
+
+def is_missing(value) -> bool:
+    """
+    @return: Whether value is None, NaN or NaT
+    """
+    return value is None or (
+        not isinstance(value, str) and pd.api.types.is_scalar(value) and pd.isna(value)
+    )
+
+
+def format_value(value) -> str:
+    """
+    @return: Raw string form of a single typed value, None if it is missing
+    """
+    if is_missing(value):
+        return None
+    if isinstance(value, (datetime.date, pd.Timestamp)):
+        return value.strftime(DATE_FORMAT)
+    return str(value)
+
+
+def format_values(values: dict) -> dict:
+    """
+    Convert typed values of a single job application back to raw strings,
+    the way they are written to CSV and store logs
+    """
+    return {column: format_value(value) for column, value in values.items()}
+
+
+def format_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    @return: Copy of typed job applications with raw string values
+    """
+    return df.assign(**{column: format_column(df[column]) for column in df.columns})
+
+
+def format_column(column: pd.Series) -> pd.Series:
+    if pd.api.types.is_datetime64_any_dtype(column):
+        return column.dt.strftime(DATE_FORMAT)
+    if DTYPES.get(column.name) == "datetime64[ns]":
+        # Dates kept as entered, next to parsed ones
+        return column.map(format_value).astype(object)
+    return column.astype(object)
+
+
+def to_csv(df: pd.DataFrame, path_or_buf) -> None:
+    """
+    Write typed job applications to CSV, with dates in DATE_FORMAT and
+    values kept as entered written back unchanged
+    """
+    format_frame(df).to_csv(path_or_buf, index=False)
@@ -0,0 +1,128 @@
+import constants
+import datetime
+import pandas as pd
+
+from . import schema, status
+from scripts.utils.helpers import get_root_from_url
+
+# Aggregate kinds, in report order
+KINDS = ["status", "week", "company", "platform"]
+
+
+def keys(values: dict) -> list[tuple[str, str, bool]]:
+    """
+    @param values: Job application values, keyed by column name
+    @return: (kind, key, responded) for every aggregate the application counts in
+    """
+    values = schema.parse_values(values)
+    current = values.get("Status")
+    # Missing statuses are NaN, which is truthy
+    responded = (
+        not schema.is_missing(current)
+        and bool(current)
+        and current != status.Status.INIT.value
+    )
+    keys = []
+    if isinstance(current, str):
+        keys.append(("status", current, responded))
+    applied = values.get("Date Applied")
+    if isinstance(applied, (datetime.date, pd.Timestamp)) and not pd.isna(applied):
+        monday = applied - datetime.timedelta(days=applied.weekday())
+        keys.append(("week", monday.strftime("%Y-%m-%d"), responded))
+    if isinstance(values.get("Company"), str) and values["Company"]:
+        keys.append(("company", values["Company"], responded))
+    platform = platform_of(values.get("Portal Link"))
+    if platform:
+        keys.append(("platform", platform, responded))
+    return keys
+
+
+def platform_of(link: str) -> str:
+    """
+    @return: Platform name for supported platforms, otherwise the link's domain
+    """
+    if not isinstance(link, str) or not link:
+        return None
+    root = get_root_from_url(link)
+    for part in root.split("."):
+        if part in constants.PLATFORM_MAP:
+            return constants.PLATFORM_MAP[part]
+    return root
+
+
+class Stats:
+    """
+    Funnel aggregates over job applications: counts per status, applications
+    per week, and response rates per company and platform. Like the dedup
+    index, it is updated one application at a time as the store changes.
+
+    Example usage:
+    stats = Stats.build(store.load())
+    print(stats.report())
+    """
+
+    def __init__(self):
+        self.counts = {}  # (kind, key) -> [applications, responses]
+
+    @staticmethod
+    def build(df: pd.DataFrame) -> "Stats":
+        """
+        @param df: Job applications
+        @return: Aggregates over every row of df
+        """
+        stats = Stats()
+        for values in df.to_dict("records"):
+            stats.add(values)
+        return stats
+
+    def add(self, values: dict) -> None:
+        for kind, key, responded in keys(values):
+            count = self.counts.setdefault((kind, key), [0, 0])
+            count[0] += 1
+            count[1] += responded
+
+    def remove(self, values: dict) -> None:
+        for kind, key, responded in keys(values):
+            count = self.counts.get((kind, key))
+            if count is None:
+                continue
+            count[0] -= 1
+            count[1] -= responded
+            if count[0] <= 0:
+                del self.counts[(kind, key)]
+
+    def total(self) -> int:
+        return sum(n for (kind, _), (n, _) in self.counts.items() if kind == "status")
+
+    def report(self, limit: int = constants.STATS_LIMIT) -> str:
+        """
+        @param limit: Maximum rows shown per company and platform table
+        @return: Tables of counts per status, applications per week, and
+            response rates per company and platform
+        """
+        by_kind = {kind: {} for kind in KINDS}
+        for (kind, key), count in self.counts.items():
+            by_kind[kind][key] = count
+        total = self.total()
+        responses = sum(r for (n, r) in by_kind["status"].values())
+        lines = [
+            f"{constants.OKGREEN}{total} application(s), "
+            + f"{responses / total if total else 0:.0%} response rate{constants.ENDC}",
+            "",
+            f"{'Status':<24}{'Count':>8}{'Share':>8}",
+        ]
+        known = [s.value for s in status.Status]
+        # Statuses entered through "Other" follow the funnel
+        extra = sorted(value for value in by_kind["status"] if value not in known)
+        for value in known + extra:
+            n = by_kind["status"].get(value, [0, 0])[0]
+            lines.append(f"{value[:23]:<24}{n:>8}{n / total if total else 0:>8.0%}")
+        lines += ["", f"{'Week of':<24}{'Count':>8}"]
+        for week in sorted(by_kind["week"])[-limit:]:
+            lines.append(f"{week:<24}{by_kind['week'][week][0]:>8}")
+        for kind in ["company", "platform"]:
+            lines += ["", f"{kind.capitalize():<24}{'Count':>8}{'Response':>10}"]
+            ranked = sorted(by_kind[kind].items(), key=lambda item: -item[1][0])
+            for key, (n, responded) in ranked[:limit]:
+                lines.append(f"{key[:23]:<24}{n:>8}{responded / n:>10.0%}")
+        return "\n".join(lines)
@@ -0,0 +1,170 @@
+import abc
+import constants
+import pandas as pd
+
+from scripts.models import schema
+from scripts.models.stats import Stats
+from scripts.utils.dedup import DedupIndex
+
+
+class Store:
+    """
+    Abstract base class for job application store implementations. Stores
+    return DataFrames indexed by a stable row id, which is what update()
+    and delete() take, typed by scripts.models.schema.
+    """
+
+    __metaclass__ = abc.ABCMeta
+
+    @property
+    def name(self):
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def exists(self) -> bool:
+        """
+        Check if the store (or a CSV file to import from) exists on disk
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def init(self) -> None:
+        """
+        Create an empty store
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def load(self) -> pd.DataFrame:
+        """
+        Load all job applications, indexed by row id
+        """
+        raise NotImplementedError
+
+    def find(self, column: str, value: str) -> pd.DataFrame:
+        """
+        Find job applications by column value
+
+        @param column: Column name to match on
+        @param value: Value to match
+        @return: Matching job applications, indexed by row id
+        """
+        df = self.load()
+        return df.loc[df[column] == value]
+
+    def get(self, row_id: int) -> pd.Series:
+        """
+        @param row_id: Row id of the job application
+        @return: Job application, or None if the row id does not exist
+        """
+        df = self.load()
+        return df.loc[row_id] if row_id in df.index else None
+
+    def dedup_index(self) -> DedupIndex:
+        """
+        @return: Index of portal links and (company, position) keys in the store
+        """
+        return DedupIndex.build(self.load())
+
+    def duplicates(self, df: pd.DataFrame) -> list[str]:
+        """
+        @param df: New job applications
+        @return: Duplicate reason (or None) for each row of df
+        """
+        return self.dedup_index().duplicates(df)
+
+    def stats(self) -> Stats:
+        """
+        @return: Funnel stats over the job applications in the store
+        """
+        return Stats.build(self.load())
+
+    def count(self) -> int:
+        """
+        @return: Number of job applications
+        """
+        return len(self.load().index)
+
+    def sort_index(self, column: str) -> list[int]:
+        """
+        @param column: Column name to sort by
+        @return: Positions of the loaded rows in sorted order
+        """
+        column = self.load()[column].reset_index(drop=True)
+        return column.sort_values(
+            kind="stable", na_position="last", key=schema.sort_key
+        ).index.tolist()
+
+    def iter_pages(self, page_size: int, sort_by: str = None):
+        """
+        Yield job applications one page at a time
+
+        @param page_size: Number of rows per page
+        @param sort_by: Optional column name to sort by
+        @return: Generator of DataFrames indexed by row id
+        """
+        df = self.load()
+        order = self.sort_index(sort_by) if sort_by else None
+        for start in range(0, len(df.index), page_size):
+            if order is None:
+                yield df.iloc[start : start + page_size]
+            else:
+                yield df.iloc[order[start : start + page_size]]
+
+    @abc.abstractmethod
+    def append(self, df: pd.DataFrame) -> list[int]:
+        """
+        Append job applications
+
+        @param df: DataFrame with one row per job application
+        @return: Row ids assigned to the new rows
+        """
+        raise NotImplementedError
+
+    def append_new(self, df: pd.DataFrame) -> tuple[list[int], list[str]]:
+        """
+        Append the job applications that aren't tracked yet. Stores written
+        by several processes check and append under one writer lock, so two
+        processes can't both add the same application.
+
+        @param df: DataFrame with one row per job application
+        @return: Row ids assigned to the new rows, and the duplicate reason
+            (or None if it was appended) for each row of df
+        """
+        reasons = self.duplicates(df)
+        new = df.loc[[reason is None for reason in reasons]]
+        return (self.append(new) if len(new.index) else []), reasons
+
+    @abc.abstractmethod
+    def update(self, row_id: int, values: dict) -> None:
+        """
+        Update columns of a single job application
+
+        @param row_id: Row id of the job application
+        @param values: Column name to new value mapping
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def delete(self, row_id: int) -> None:
+        """
+        Delete a single job application
+
+        @param row_id: Row id of the job application
+        """
+        raise NotImplementedError
+
+    def flush(self) -> None:
+        """
+        Export changes not yet written to the CSV file. Writes leave the CSV
+        to this, so a single-row write doesn't rewrite the whole file.
+        """
+        self.export_csv()
+
+    def export_csv(self, path: str = constants.SOURCE_CSV) -> None:
+        """
+        Export all job applications to CSV
+
+        @param path: Path of the CSV file to write
+        """
+        schema.to_csv(self.load(), path)
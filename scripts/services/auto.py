@@ -1,15 +1,17 @@
+import asyncio
 import constants
 import datetime
+import httpx
+import logging
 import multiprocessing
 import os
-import pandas as pd
 import pathlib
 import threading
 import sys
 
-from .redis import redis
+from concurrent.futures import ThreadPoolExecutor
 
-from . import configuration, scraper
+from . import cache, configuration, coordination, display, scraper, vault
 from scripts.models import entry, status
 
 # Added to make the utils module available to the script
@@ -20,8 +22,13 @@ from scripts.utils.errors import (
     AutoServiceError,
     InvalidURLError,
 )
-from scripts.utils.helpers import has_gui, verify_headless_support
-from scripts.utils.threader import LoggingPool
+from scripts.utils.helpers import (
+    get_root_from_url,
+    has_gui,
+    verify_headless_support,
+)
+from scripts.utils.threader import LogExceptions, LoggingPool
+from scripts.utils.timer import PhaseTimer
 from scripts.utils.logger import LoggerBuilder
 
 
@@ -32,9 +39,10 @@ class AutoService(object):
     """
 
     def __init__(self):
+        self.torn_down = False  # Set by teardown(), which __del__ calls again
         self.verify_gui_support()  # Run GUI support check
+        self.start_coordination()  # Start coordination service
         self.setup()  # Initialize service instance variables
-        self.start_redis()  # Start Redis service
 
     def __getattribute__(self, __name: str) -> any:
         if __name != "thread_local":
@@ -50,7 +58,9 @@ class AutoService(object):
         # Define threading
         self.thread_local = threading.local()
         # Define builders
-        self.configuration_builder = configuration.ConfigurationBuilder()
+        self.configuration_builder = configuration.ConfigurationBuilder(
+            service=self.service
+        )
         self.scraper_builder = scraper.ScraperBuilder()
         self.logger_builder = LoggerBuilder()
         # Partially build the auth engine
@@ -59,6 +69,14 @@ class AutoService(object):
             delay_driver_build=True,
             headed_support=self.gui_support,
         )
+        # Define persistent cache of scraped job posts
+        self.cache = cache.ScrapeCache()
+        # Define timer for scrape phases of the current batch
+        self.timer = PhaseTimer()
+        # Define HTTP client shared by HTTP only platforms
+        self.http_client = httpx.Client(**constants.HTTP_CLIENT_OPTS)
+        # Define pool of warm drivers shared by scraper engines
+        self.driver_pool = scraper.DriverPool(builder=self.scraper_builder)
 
     def verify_gui_support(self) -> None:
         """
@@ -71,66 +89,87 @@ class AutoService(object):
                 f"{constants.WARNING}GUI support not detected, running in headless mode...{constants.ENDC}"
             )
             verify_headless_support()
-            ####### DO NOT REMOVE CONDITIONAL IMPORT #######
-            from pyvirtualdisplay import (
-                Display,
-            )  # Should be installed in verify_headless_support()
-
-            ################################################
-            self.display = Display(visible=0, size=(800, 600))
+            # Join the virtual display shared by trapp processes on this host
+            self.display = display.SharedDisplay()
             self.display.start()
 
-    def start_redis(self) -> None:
+    def start_coordination(self) -> None:
         """
-        Start Redis service
+        Start coordination service (in-process, or Redis through Docker)
         """
-        print("Starting Redis service...", end=" ")
-        self.service = redis.RedisService(
+        self.service = coordination.CoordinationBuilder.build(
             password=f"{os.getenv('REDIS_TRAPP_PWD', constants.REDIS_TEST_PWD)}"
         )
+        print(f"Starting {self.service.name} service...", end=" ")
         try:
             self.service.init()
         except ServiceAlreadyRunningError as e:
             print(e)
-        assert self.service.status(), "Redis service not running"
+        assert self.service.status(), f"{self.service.name} service not running"
         print(f"{constants.OKGREEN}OK{constants.ENDC}")
 
     def teardown(self) -> None:
         """
-        Stop running processes and services
+        Stop running processes and services, once
         """
-        # If GUI is not supported, stop virtual display
+        if self.torn_down:
+            return
+        self.torn_down = True
+        # Quit pooled drivers and close HTTP connections
+        self.driver_pool.shutdown()
+        self.http_client.close()
+        # If GUI is not supported, leave the shared virtual display
         if not self.gui_support:
             self.display.stop()
-        # Stop Redis service
-        print("Stopping Redis service...", end=" ")
+        # Stop coordination service
+        print(f"Stopping {self.service.name} service...", end=" ")
         self.service.stop()
         print(f"{constants.OKGREEN}OK{constants.ENDC}")
         # Delete thread local
         del self.thread_local
 
-    def run(self, url: str) -> pd.DataFrame:
+    def run(self, url: str) -> entry.Entry:
         """
         @param url: URL to scrape job application data from
         @param result_queue: Queue to store multiprocessing results in (optional)
-        @return: Pandas DataFrame containing a single row job entry
+        @return: Job entry record
         """
         # Define builders
         # Create configuration and scraper engine
-        config = self.configuration_builder.build(url, self.service.connect())
-        scraper_engine = self.scraper_builder.build()
+        with self.timer.phase("connect"):
+            config = self.configuration_builder.build(url)
+        scraper_engine = self.scraper_builder.build(
+            delay_driver_build=True, http_client=self.http_client
+        )
         try:
-            # Run scraper
-            (title, company, location, post_url) = scraper_engine.run(
-                config, auth_engine=self.auth_engine
-            )
+            if config.platform.http_only:
+                # Run scraper without creating a driver
+                (title, company, location, post_url) = scraper_engine.run(
+                    config, timer=self.timer
+                )
+            else:
+                # Run scraper on a driver leased from the pool
+                with self.driver_pool.lease() as driver:
+                    scraper_engine.create_driver(custom_driver=driver, pooled=True)
+                    (title, company, location, post_url) = scraper_engine.run(
+                        config, auth_engine=self.auth_engine, timer=self.timer
+                    )
         except Exception as e:
             raise AutoServiceError(
                 msg=f"Error encountered while scraping {url}", err=e, url=url
-            )
+            ) from e
 
-        # Create entry
-        new_entry = entry.Entry(
+        self.cache.put(config.platform.url, (title, company, location, post_url))
+        return self.create_entry(title, company, location, post_url)
+
+    def create_entry(
+        self, title: str, company: str, location: str, post_url: str
+    ) -> entry.Entry:
+        """
+        @param title, company, location, post_url: Scraped job post data
+        @return: Job entry record
+        """
+        return entry.Entry(
             company=company,
             position=title,
             date_applied=datetime.datetime.now(),
@@ -139,44 +178,152 @@ class AutoService(object):
             notes=f"{location}",
         )
 
-        # Get dataframe
-        return new_entry.create_dataframe()
+    async def async_run(
+        self,
+        url: str,
+        client: httpx.AsyncClient,
+        executor: ThreadPoolExecutor,
+        host_limits: dict,
+    ) -> entry.Entry:
+        """
+        Asyncio counterpart of run(). HTTP only platforms are fetched on the
+        event loop, everything else runs through run() on the executor.
 
-    def batch_run(self, urls: list[str]) -> pd.DataFrame:
+        @param url: URL to scrape job application data from
+        @param client: Async HTTP client shared by the batch
+        @param executor: Executor for browser bound work
+        @param host_limits: Per host semaphores shared by the batch
+        @return: Job entry record
+        """
+        platform = self.configuration_builder.get_platform(url)
+        if not platform.http_only:
+            return await asyncio.get_running_loop().run_in_executor(
+                executor, LogExceptions(self.run), url
+            )
+        host = get_root_from_url(platform.url)
+        if host not in host_limits:
+            host_limits[host] = asyncio.Semaphore(constants.ASYNC_HOST_CONCURRENCY)
+        print(f"Fetching {platform.url}...")
+        try:
+            async with host_limits[host]:
+                with self.timer.phase("fetch"):
+                    response = await client.get(platform.url)
+                    response.raise_for_status()
+            with self.timer.phase("parse"):
+                (title, company, location, post_url) = platform.parse(response.text)
+        except Exception as e:
+            LoggerBuilder.build(log_level=logging.ERROR).error(
+                f"Exception in async worker: {e}"
+            )
+            raise AutoServiceError(
+                msg=f"Error encountered while scraping {url}", err=e, url=url
+            ) from e
+        self.cache.put(platform.url, (title, company, location, post_url))
+        return self.create_entry(title, company, location, post_url)
+
+    async def async_batch_run(self, urls: list[str]) -> list[any]:
         """
         @param urls: List of URLs to scrape job application data from
-        @return: Pandas DataFrame containing multiple job entries
+        @return: List of job entry records or raised exceptions, one per URL
+        """
+        host_limits = {}
+        with ThreadPoolExecutor(
+            max_workers=min(len(urls), constants.ASYNC_BROWSER_WORKERS)
+        ) as executor:
+            async with httpx.AsyncClient(**constants.HTTP_CLIENT_OPTS) as client:
+                return await asyncio.gather(
+                    *[
+                        self.async_run(url, client, executor, host_limits)
+                        for url in urls
+                    ],
+                    return_exceptions=True,
+                )
+
+    def cached_run(self, urls: list[str]) -> tuple[list[entry.Entry], list[str]]:
+        """
+        @param urls: List of URLs to scrape job application data from
+        @return: Job entry records served from cache, and URLs left to scrape
+        """
+        final, misses = [], []
+        for url in urls:
+            try:
+                key = self.configuration_builder.get_platform(url).url
+            except InvalidURLError:
+                misses.append(url)  # Reported by the batch engine
+                continue
+            scraped = self.cache.get(key)
+            if scraped is None:
+                misses.append(url)
+            else:
+                final.append(self.create_entry(*scraped))
+        return final, misses
+
+    def thread_batch_run(self, urls: list[str]) -> list[any]:
+        """
+        @param urls: List of URLs to scrape job application data from
+        @return: List of job entry records or raised exceptions, one per URL
         """
-        # Remove possible duplicates
-        if len(urls) != len(set(urls)):
-            print("Duplicate URLs detected, removing duplicates...")
-        urls = set(urls)
         # Enable logging
         multiprocessing.log_to_stderr()
         # Define worker pool
         pool = LoggingPool(processes=min(len(urls), constants.MAX_WORKERS))
-        # Get results
-        results, final = [], []
-        failed_urls = []
         # Start worker functions
-        for url in urls:
-            results.append(pool.apply_async(self.run, args=(url,)))
+        results = [pool.apply_async(self.run, args=(url,)) for url in urls]
 
         # Wait for all workers to finish
         pool.close()
         pool.join()
 
+        outcomes = []
         for result in results:
             try:
-                r = result.get()
+                outcomes.append(result.get())
             except Exception as e:
-                if isinstance(e, AutoServiceError) or isinstance(e, InvalidURLError):
-                    if isinstance(e, InvalidURLError):
+                outcomes.append(e)
+
+        # Terminate pool
+        pool.terminate()
+        return outcomes
+
+    def batch_run(
+        self, urls: list[str], engine: str = constants.BATCH_ENGINE
+    ) -> tuple[list[entry.Entry], list[str]]:
+        """
+        @param urls: List of URLs to scrape job application data from
+        @param engine: Batch engine to use, either "thread" or "async"
+        @return: Job entry records, and failed URLs. Build a single DataFrame
+            from them with entry.Entry.to_frame()
+        """
+        # Remove possible duplicates
+        if len(urls) != len(set(urls)):
+            print("Duplicate URLs detected, removing duplicates...")
+        urls = list(set(urls))
+        batch_size = len(urls)
+        # Reset scrape phase timings and cache counters
+        self.timer = PhaseTimer()
+        self.cache.reset_stats()
+        # Re-check auth state once per batch
+        vault.VaultService.clearAuthState()
+        # Serve previously scraped job posts from cache
+        final, urls = self.cached_run(urls)
+        # Get results
+        if not urls:
+            outcomes = []
+        elif engine == "async":
+            outcomes = asyncio.run(self.async_batch_run(urls))
+        else:
+            outcomes = self.thread_batch_run(urls)
+        failed_urls = []
+
+        for r in outcomes:
+            if isinstance(r, Exception):
+                if isinstance(r, AutoServiceError) or isinstance(r, InvalidURLError):
+                    if isinstance(r, InvalidURLError):
                         print(
-                            f"[{constants.FAIL}ERROR{constants.ENDC}]: Invalid URL found! No matching platform. URL: {e.msg.split(': ')[1]}"
+                            f"[{constants.FAIL}ERROR{constants.ENDC}]: Invalid URL found! No matching platform. URL: {r.msg.split(': ')[1]}"
                         )
                     else:
-                        failed_urls.append(e.url)
+                        failed_urls.append(r.url)
                 else:
                     print(
                         f"{constants.FAIL}\
@@ -184,8 +331,7 @@ class AutoService(object):
                         {constants.ENDC}"
                     )
                 continue
-            if not isinstance(r, Exception):
-                final.append(r)
+            final.append(r)
 
         if failed_urls:
             print(
@@ -194,11 +340,19 @@ class AutoService(object):
             for url in failed_urls:
                 print(f"[{constants.FAIL}ERROR{constants.ENDC}]: {url}")
 
-        # Terminate pool
-        pool.terminate()
+        # Persist scraped job posts
+        self.cache.save()
+
+        # Report time spent (and saved) in each scrape phase
+        print("===== Scrape Timings =====")
+        print(self.timer.report(urls=batch_size))
+        print(self.cache.report())
+        pool_stats = self.service.pool_stats()
+        print(
+            f"{self.service.name} pool: {pool_stats['in_use']}/{pool_stats['size']} connection(s) in use"
+        )
 
         # Return results
         if not final:
             print(f"{constants.WARNING}No usable results found!{constants.ENDC}")
-            return pd.DataFrame()
-        return pd.concat(final, ignore_index=True), failed_urls
+        return final, failed_urls
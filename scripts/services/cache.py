@@ -0,0 +1,108 @@
+import constants
+import json
+import os
+import pathlib
+import threading
+import time
+
+from collections import OrderedDict
+
+
+class ScrapeCache:
+    """
+    Persistent LRU cache of scraped job posts, keyed by the job URL after
+    Platform.clean_url(). Entries expire after a TTL and the least recently
+    used entries are evicted once the cache is full.
+
+    Example usage:
+    cache = ScrapeCache()
+    if (scraped := cache.get(platform.url)) is None:
+        cache.put(platform.url, platform.scrape_wrapper())
+    cache.save()
+    """
+
+    def __init__(
+        self,
+        path: str = constants.SCRAPE_CACHE_PATH,
+        ttl: int = constants.SCRAPE_CACHE_TTL,
+        max_entries: int = constants.SCRAPE_CACHE_MAX_ENTRIES,
+    ):
+        """
+        @param path: Path of the cache file on disk
+        @param ttl: Seconds after which an entry expires
+        @param max_entries: Maximum number of entries kept
+        """
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.entries = OrderedDict()  # url -> [timestamp, (title, company, location, post_url)]
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+        self.load()
+
+    def load(self) -> None:
+        """
+        Load cache entries from disk, ignoring a missing or corrupt file
+        """
+        try:
+            with open(self.path, "r") as f:
+                entries = json.load(f)
+        except (OSError, ValueError):
+            return
+        now = time.time()
+        with self.lock:
+            for url, (timestamp, scraped) in entries:
+                if now - timestamp < self.ttl:
+                    self.entries[url] = [timestamp, tuple(scraped)]
+
+    def save(self) -> None:
+        """
+        Atomically write cache entries to disk
+        """
+        with self.lock:
+            entries = [[url, value] for url, value in self.entries.items()]
+        pathlib.Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(entries, f)
+        os.replace(tmp_path, self.path)
+
+    def get(self, url: str) -> tuple[str, str, str, str]:
+        """
+        @param url: Cleaned job URL
+        @return: Cached (title, company, location, post_url), or None on a miss
+        """
+        with self.lock:
+            value = self.entries.get(url)
+            if value is None or time.time() - value[0] >= self.ttl:
+                self.entries.pop(url, None)
+                self.misses += 1
+                return None
+            self.entries.move_to_end(url)
+            self.hits += 1
+            return value[1]
+
+    def put(self, url: str, scraped: tuple[str, str, str, str]) -> None:
+        """
+        @param url: Cleaned job URL
+        @param scraped: Scraped (title, company, location, post_url)
+        """
+        with self.lock:
+            self.entries[url] = [time.time(), tuple(scraped)]
+            self.entries.move_to_end(url)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def reset_stats(self) -> None:
+        """
+        Reset hit and miss counters
+        """
+        with self.lock:
+            self.hits = self.misses = 0
+
+    def report(self) -> str:
+        """
+        @return: Hit and miss counts since the last reset
+        """
+        return f"Scrape cache: {self.hits} hit(s), {self.misses} miss(es)"
@@ -23,13 +23,14 @@ class ConfigurationContainer:
         self.platform = platform
         self.redis = redis
 
-    def inject_driver(self, driver: webdriver.Chrome) -> None:
+    def inject_driver(self, driver: webdriver.Chrome, pooled: bool = False) -> None:
         """
         Set driver for platform associated with configuration
 
         @param selenium_driver: Chrome driver instance
+        @param pooled: Whether the driver is leased from a driver pool
         """
-        self.platform.set_driver(driver)
+        self.platform.set_driver(driver, pooled=pooled)
 
 
 class ConfigurationBuilder:
@@ -37,6 +38,12 @@ class ConfigurationBuilder:
     Configuration builder factory class
     """
 
+    def __init__(self, service: any = None):
+        """
+        @param service: Coordination service to take clients from
+        """
+        self.service = service
+
     def get_platform(self, url: str) -> Platform:
         """
         Get platform from URL
@@ -53,7 +60,12 @@ class ConfigurationBuilder:
     ) -> ConfigurationContainer:
         """
         Build configuration container
+
+        @param url: URL to build configuration for
+        @param redis_client: Client to use, taken from the service's pool if not set
         """
+        if redis_client is None and self.service is not None:
+            redis_client = self.service.connect()
         return ConfigurationContainer(
             platform=self.get_platform(url), redis=redis_client
         )
@@ -0,0 +1,37 @@
+import constants
+
+from .redis.local import LocalService
+from .redis.redis import RedisService
+
+
+class CoordinationBuilder:
+    """
+    Build the service that coordinates scraper workers. The in-process
+    backend covers single process runs, Redis is needed for multi-process
+    or multi-host runs.
+    """
+
+    backends = {
+        "local": LocalService,
+        "redis": RedisService,
+    }
+
+    @staticmethod
+    def build(
+        backend: str = constants.COORDINATION_BACKEND, password: str = None
+    ) -> any:
+        """
+        Build coordination service for backend
+
+        @param backend: Name of the backend, either "local" or "redis"
+        @param password: Password for the Redis backend
+        @return: LocalService or RedisService instance
+        """
+        try:
+            service = CoordinationBuilder.backends[backend.lower()]
+        except KeyError:
+            raise ValueError(
+                f"Unknown coordination backend {backend!r}, "
+                + f"expected one of: {', '.join(CoordinationBuilder.backends)}"
+            )
+        return service(password=password)
@@ -0,0 +1,208 @@
+import constants
+import datetime
+import json
+import os
+import pathlib
+import socket
+import socketserver
+import threading
+
+from scripts.models import entry, status
+from scripts.utils.errors import (
+    DaemonError,
+    ServiceAlreadyRunningError,
+    ServiceNotRunningError,
+)
+
+
+def encode_entry(job: entry.Entry) -> dict:
+    """
+    @return: JSON safe values of an unvalidated entry
+    """
+    return {
+        "company": job.company,
+        "position": job.position,
+        "date_applied": job.date_applied.isoformat(),
+        "status": job.status.value,
+        "link": job.link,
+        "notes": job.notes,
+    }
+
+
+def decode_entry(values: dict) -> entry.Entry:
+    """
+    @return: Entry rebuilt from encode_entry() values
+    """
+    return entry.Entry(
+        company=values["company"],
+        position=values["position"],
+        date_applied=datetime.datetime.fromisoformat(values["date_applied"]),
+        status=status.Status(values["status"]),
+        link=values["link"],
+        notes=values["notes"],
+    )
+
+
+class DaemonHandler(socketserver.StreamRequestHandler):
+    """
+    Answers newline delimited JSON requests from one client connection
+    """
+
+    def handle(self) -> None:
+        for line in self.rfile:
+            try:
+                response = self.server.daemon.dispatch(json.loads(line))
+            except Exception as e:
+                response = {"error": f"{type(e).__name__}: {e}"}
+            self.wfile.write(json.dumps(response).encode() + b"\n")
+            self.wfile.flush()
+
+
+class DaemonServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True  # Don't wait for open connections on shutdown
+
+
+class TrappDaemon:
+    """
+    Long-running scrape service. It builds one AutoService, so the GUI probe,
+    coordination service, virtual display and warm drivers are set up once,
+    and runs scrape jobs sent by clients over a local Unix socket. Jobs run
+    one at a time, since they share the same drivers.
+
+    Example usage:
+    TrappDaemon().serve()  # Blocks until a client sends shutdown
+    """
+
+    def __init__(self, socket_path: str = constants.DAEMON_SOCKET_PATH, service=None):
+        """
+        @param socket_path: Path of the Unix socket to listen on
+        @param service: Scrape service to run jobs on, defaults to a new AutoService
+        """
+        self.socket_path = socket_path
+        self.service = service
+        self.jobs = threading.Lock()
+        self.server = None
+
+    def serve(self) -> None:
+        """
+        Start the scrape service and answer clients until shutdown
+        """
+        if DaemonClient(self.socket_path).available():
+            raise ServiceAlreadyRunningError(f"trapp daemon at {self.socket_path}")
+        # Socket left behind by a daemon that didn't shut down cleanly
+        if os.path.exists(self.socket_path):
+            os.remove(self.socket_path)
+        if self.service is None:
+            from scripts.services.auto import AutoService
+
+            self.service = AutoService()
+        pathlib.Path(self.socket_path).parent.mkdir(parents=True, exist_ok=True)
+        # Create the socket private to this user, so nobody else may ever submit jobs
+        umask = os.umask(0o077)
+        try:
+            self.server = DaemonServer(self.socket_path, DaemonHandler)
+        finally:
+            os.umask(umask)
+        self.server.daemon = self
+        print(
+            f"{constants.OKGREEN}trapp daemon listening on {self.socket_path}{constants.ENDC}"
+        )
+        try:
+            self.server.serve_forever()
+        finally:
+            self.server.server_close()
+            os.remove(self.socket_path)
+            # Stop drivers, display and coordination now, not whenever the
+            # service happens to be garbage collected
+            service, self.service = self.service, None
+            service.teardown()
+
+    def dispatch(self, request: dict) -> dict:
+        """
+        @param request: Client request, {"op": "ping" | "scrape" | "shutdown", ...}
+        @return: Response sent back to the client
+        """
+        op = request.get("op")
+        if op == "ping":
+            return {"pid": os.getpid()}
+        if op == "scrape":
+            with self.jobs:
+                results, failed_urls = self.service.batch_run(
+                    request["urls"], engine=request.get("engine", constants.BATCH_ENGINE)
+                )
+            return {"entries": [encode_entry(r) for r in results], "failed": failed_urls}
+        if op == "shutdown":
+            # serve_forever() runs in another thread, so this doesn't block
+            threading.Thread(target=self.server.shutdown).start()
+            return {}
+        raise ValueError(f"Unknown op: {op}")
+
+
+class DaemonClient:
+    """
+    Thin client for a running TrappDaemon. batch_run() mirrors
+    AutoService.batch_run(), so callers can use either one.
+
+    Example usage:
+    client = DaemonClient()
+    service = client if client.available() else AutoService()
+    entries, failed_urls = service.batch_run(urls)
+    """
+
+    def __init__(self, socket_path: str = constants.DAEMON_SOCKET_PATH):
+        """
+        @param socket_path: Path of the daemon's Unix socket
+        """
+        self.socket_path = socket_path
+
+    def request(self, op: str, **kwargs) -> dict:
+        """
+        Send one request to the daemon and wait for its response
+
+        @raise ServiceNotRunningError: If no daemon answers on the socket
+        @raise DaemonError: If the daemon failed to run the request
+        """
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+                conn.settimeout(constants.DAEMON_CONNECT_TIMEOUT)
+                conn.connect(self.socket_path)
+                conn.settimeout(None)  # Scrape jobs take as long as they take
+                conn.sendall(json.dumps({"op": op, **kwargs}).encode() + b"\n")
+                with conn.makefile("rb") as stream:
+                    line = stream.readline()
+        except OSError as e:
+            raise ServiceNotRunningError(f"trapp daemon at {self.socket_path} ({e})")
+        if not line:
+            raise ServiceNotRunningError(f"trapp daemon at {self.socket_path}")
+        response = json.loads(line)
+        if "error" in response:
+            raise DaemonError(response["error"])
+        return response
+
+    def available(self) -> bool:
+        """
+        @return: True if a daemon answers on the socket
+        """
+        if not os.path.exists(self.socket_path):
+            return False
+        try:
+            self.request("ping")
+        except ServiceNotRunningError:
+            return False
+        return True
+
+    def batch_run(
+        self, urls: list[str], engine: str = constants.BATCH_ENGINE
+    ) -> tuple[list[entry.Entry], list[str]]:
+        """
+        @param urls: List of URLs to scrape job application data from
+        @param engine: Batch engine the daemon should use, "thread" or "async"
+        @return: Job entry records, and failed URLs
+        """
+        response = self.request("scrape", urls=urls, engine=engine)
+        return [decode_entry(values) for values in response["entries"]], response[
+            "failed"
+        ]
+
+    def shutdown(self) -> None:
+        self.request("shutdown")
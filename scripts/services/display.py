@@ -0,0 +1,218 @@
+import constants
+import contextlib
+import fcntl
+import json
+import os
+import pathlib
+import select
+import signal
+import socket
+import subprocess
+
+
+class SharedDisplay:
+    """
+    Long-lived Xvfb display shared by every trapp process on the host. The
+    first client starts Xvfb in its own session, later clients reuse it, and
+    the clients holding it are reference counted through a state file under
+    .cache/. Dead clients are pruned, and unless DISPLAY_KEEP_WARM is off the
+    display stays up after the last client leaves so the next run skips the
+    Xvfb boot.
+
+    Example usage:
+    display = SharedDisplay()
+    display.start()  # Sets $DISPLAY
+    ...
+    display.stop()
+    """
+
+    def __init__(
+        self,
+        state_path: str = constants.DISPLAY_STATE_PATH,
+        lock_path: str = constants.DISPLAY_LOCK_PATH,
+        size: tuple[int, int] = constants.DISPLAY_SIZE,
+        keep_warm: bool = constants.DISPLAY_KEEP_WARM,
+    ):
+        """
+        @param state_path: Path of the display state file
+        @param lock_path: Path of the lock file guarding the state file
+        @param size: Screen size of a newly started display
+        @param keep_warm: Keep the display running when no client holds it
+        """
+        self.state_path = state_path
+        self.lock_path = lock_path
+        self.size = size
+        self.keep_warm = keep_warm
+        self.display = None  # e.g. ":99" once started
+        self.old_display = None
+
+    def start(self) -> "SharedDisplay":
+        """
+        Join the shared display, starting Xvfb if none is running
+        """
+        with self.locked():
+            state = self.read_state()
+            if state is None or not SharedDisplay.usable(state):
+                print("Starting virtual display...", end=" ")
+                state = {**self.launch(), "clients": []}
+                print(f"{constants.OKGREEN}OK{constants.ENDC}")
+            else:
+                print(f"Reusing virtual display {state['display']}")
+            state["clients"] = [
+                pid for pid in state["clients"] if SharedDisplay.alive(pid)
+            ] + [os.getpid()]
+            self.write_state(state)
+        self.display = state["display"]
+        self.old_display = os.environ.get("DISPLAY")
+        os.environ["DISPLAY"] = self.display
+        return self
+
+    def stop(self) -> "SharedDisplay":
+        """
+        Leave the shared display, stopping Xvfb if this was the last client
+        and the display is not kept warm
+        """
+        if self.display is None:
+            return self
+        with self.locked():
+            state = self.read_state()
+            if state is not None:
+                state["clients"] = [
+                    pid
+                    for pid in state["clients"]
+                    if pid != os.getpid() and SharedDisplay.alive(pid)
+                ]
+                if not state["clients"] and not self.keep_warm:
+                    self.discard(state)
+                else:
+                    self.write_state(state)
+        if self.old_display is None:
+            os.environ.pop("DISPLAY", None)
+        else:
+            os.environ["DISPLAY"] = self.old_display
+        self.display = None
+        return self
+
+    def shutdown(self) -> None:
+        """
+        Stop the shared display regardless of its clients
+        """
+        with self.locked():
+            state = self.read_state()
+            if state is not None:
+                self.discard(state)
+
+    def discard(self, state: dict) -> None:
+        """
+        Stop the display in state and remove the state file. The state file
+        survives reboots, so the recorded pid is only killed if it still
+        serves the display.
+        """
+        if SharedDisplay.usable(state):
+            SharedDisplay.kill(state["pid"])
+        os.remove(self.state_path)
+
+    def launch(self) -> dict:
+        """
+        Start Xvfb in its own session, so it outlives this process
+
+        @return: Display name and Xvfb pid
+        """
+        rfd, wfd = os.pipe()
+        try:
+            process = subprocess.Popen(
+                [
+                    constants.XVFB_PATH,
+                    "-displayfd",
+                    str(wfd),
+                    "-screen",
+                    "0",
+                    f"{self.size[0]}x{self.size[1]}x24",
+                    "-nolisten",
+                    "tcp",
+                ],
+                pass_fds=[wfd],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                start_new_session=True,
+            )
+            os.close(wfd)
+            # Xvfb writes the display number once it accepts connections
+            ready, _, _ = select.select([rfd], [], [], constants.DISPLAY_START_TIMEOUT)
+            number = os.read(rfd, 16).decode().strip() if ready else ""
+        finally:
+            os.close(rfd)
+        if not number:
+            process.kill()
+            raise Exception("Virtual display failed to start")
+        return {"display": f":{number}", "pid": process.pid}
+
+    @contextlib.contextmanager
+    def locked(self):
+        """
+        Hold the display lock across processes
+        """
+        pathlib.Path(self.lock_path).parent.mkdir(parents=True, exist_ok=True)
+        with open(self.lock_path, "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def read_state(self) -> dict:
+        """
+        @return: Display state, or None if there is no (readable) state file
+        """
+        try:
+            with open(self.state_path, "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def write_state(self, state: dict) -> None:
+        """
+        Atomically write the display state
+        """
+        tmp_path = f"{self.state_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.state_path)
+
+    @staticmethod
+    def usable(state: dict) -> bool:
+        """
+        Check that the display in state is still served by its Xvfb. After a
+        reboot the pid may belong to an unrelated process, so the display
+        must also accept a connection on its X socket.
+        """
+        if not SharedDisplay.alive(state["pid"]):
+            return False
+        number = state["display"].lstrip(":").split(".")[0]
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+            probe.settimeout(constants.DISPLAY_PROBE_TIMEOUT)
+            try:
+                probe.connect(f"{constants.X11_SOCKET_DIR}/X{number}")
+            except OSError:
+                return False
+        return True
+
+    @staticmethod
+    def alive(pid: int) -> bool:
+        """
+        @return: True if a process with pid is running
+        """
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            return True  # Running, owned by another user
+        return True
+
+    @staticmethod
+    def kill(pid: int) -> None:
+        try:
+            os.kill(pid, signal.SIGTERM)
+        except ProcessLookupError:
+            pass
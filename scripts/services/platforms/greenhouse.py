@@ -2,6 +2,7 @@ import constants
 import pathlib
 import sys
 
+from bs4 import BeautifulSoup
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.wait import WebDriverWait
 from selenium.webdriver.support.expected_conditions import (
@@ -18,6 +19,8 @@ class GreenHouse(Platform):
     name = "GreenHouse"
     base_url = "https://boards.greenhouse.io"
     login_url = ""
+    page_ready = (By.CLASS_NAME, "app-title")  # Job post title
+    http_only = True
 
     def __init__(self, url: str):
         super().__init__(url)
@@ -40,6 +43,15 @@ class GreenHouse(Platform):
         location = self.curr_driver.find_element(By.CLASS_NAME, "location").text
         return (title, company, location, self.url)
 
+    def parse(self, html: str) -> tuple[str, str, str, str]:
+        soup = BeautifulSoup(html, "html.parser")
+        title = soup.find(class_="app-title").get_text(strip=True)
+        company = (
+            soup.find(class_="company-name").get_text(strip=True).replace("at ", "")
+        )
+        location = soup.find(class_="location").get_text(strip=True)
+        return (title, company, location, self.url)
+
     def clean_url(self):
         pass
 
@@ -23,6 +23,7 @@ class Handshake(Platform):
     name = "Handshake"
     base_url = "https://app.joinhandshake.com"
     login_url = "https://app.joinhandshake.com/login"
+    page_ready = (By.ID, "skip-to-content")  # Job post container
 
     def __init__(self, url: str):
         super().__init__(url)
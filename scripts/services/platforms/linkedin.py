@@ -23,6 +23,7 @@ class LinkenIn(Platform):
     name = "LinkedIn"
     base_url = "https://www.linkedin.com"
     login_url = "https://www.linkedin.com/login"
+    page_ready = (By.CSS_SELECTOR, ".t-24")  # Job post title
 
     def __init__(self, url: str):
         super().__init__(url)
@@ -0,0 +1,58 @@
+import threading
+
+
+class LocalClient:
+    """
+    In-process stand-in for the Redis client. Holds one thread lock per
+    resource name, which is all the scraper needs to coordinate workers
+    running in a single process.
+    """
+
+    def __init__(self):
+        self.locks = {}
+        self.guard = threading.Lock()
+
+    def lock(self, name: str) -> threading.Lock:
+        """
+        Get the thread lock for a resource, creating it if needed
+        """
+        with self.guard:
+            return self.locks.setdefault(name, threading.Lock())
+
+    def ping(self) -> bool:
+        return True
+
+    def flushall(self) -> None:
+        with self.guard:
+            self.locks.clear()
+
+
+class LocalService:
+    """
+    Coordination service for runs confined to a single process. Mirrors the
+    RedisService interface without starting a Docker container.
+    """
+
+    name = "In-process coordination"
+    client = LocalClient()  # Shared by every worker thread in the process
+
+    def __init__(self, password: str = None):
+        pass
+
+    def init(self) -> None:
+        pass
+
+    def status(self) -> bool:
+        return True
+
+    def connect(self) -> LocalClient:
+        return LocalService.client
+
+    def pool_stats(self) -> dict:
+        return {"size": 0, "in_use": 0}  # No connections to pool
+
+    def flush(self) -> None:
+        LocalService.client.flushall()
+
+    def stop(self) -> None:
+        self.flush()
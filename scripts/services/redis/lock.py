@@ -1,28 +1,114 @@
+import constants
 import random
 import redis
+import time
 import uuid as id
 
+from .local import LocalClient
+
+# Delete the lock only if it is still held with our token, then wake waiters
+RELEASE_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    redis.call("del", KEYS[1])
+    redis.call("publish", KEYS[2], ARGV[1])
+    return 1
+end
+return 0
+"""
+
 
 class Lock:
     """
-    Distributed lock using Redis
+    Distributed lease lock using Redis. The lock expires after a TTL so a
+    crashed holder cannot deadlock other workers, releases are checked
+    against the holder's token, and waiters block on a pub/sub release
+    notification instead of spinning on SETNX.
+
+    Example usage:
+    with Lock(client=client, name="LinkedIn"):
+        ...
     """
 
-    def __init__(self, client: redis.StrictRedis, name: str):
+    def __init__(
+        self,
+        client: redis.StrictRedis,
+        name: str,
+        ttl: float = constants.REDIS_LOCK_TTL,
+    ):
+        """
+        @param client: Redis client
+        @param name: Name of the resource to lock
+        @param ttl: Seconds after which an unreleased lock expires
+        """
         self.client = client
         self.name = Lock.uuid(name)
+        self.channel = f"{self.name}:released"
+        self.ttl = ttl
+        self.token = None
+
+    def __enter__(self) -> "Lock":
+        self.acquire()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.release()
+
+    def try_acquire(self, token: str) -> bool:
+        """
+        Make a single attempt at acquiring the lock
+        """
+        if self.client.set(self.name, token, nx=True, px=int(self.ttl * 1000)):
+            self.token = token
+            return True
+        return False
 
-    def acquire(self) -> bool:
+    def acquire(self, blocking: bool = True, timeout: float = None) -> bool:
         """
         Acquire lock
+
+        @param blocking: Whether to wait for the lock to be released
+        @param timeout: Maximum seconds to wait, forever if None
+        @return: True if the lock was acquired, False otherwise
         """
-        return self.client.setnx(self.name, 1)
+        token = str(id.uuid4())
+        if self.try_acquire(token):
+            return True
+        if not blocking:
+            return False
+        deadline = None if timeout is None else time.monotonic() + timeout
+        pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(self.channel)
+        try:
+            while True:
+                # Retry after subscribing so a release in between is not missed
+                if self.try_acquire(token):
+                    return True
+                # Sleep until released, or until the current lease expires
+                wait = self.client.pttl(self.name) / 1000
+                if wait <= 0:
+                    wait = constants.REDIS_LOCK_RETRY
+                if deadline is not None:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        return False
+                    wait = min(wait, remaining)
+                pubsub.get_message(timeout=wait)
+        finally:
+            pubsub.close()
 
     def release(self) -> bool:
         """
-        Release lock
+        Release lock, if it is still held by this instance
+
+        @return: True if the lock was released, False if it had expired
         """
-        return self.client.delete(self.name)
+        if self.token is None:
+            return False
+        released = self.client.register_script(RELEASE_SCRIPT)(
+            keys=[self.name, self.channel], args=[self.token]
+        )
+        self.token = None
+        return bool(released)
 
     @staticmethod
     def uuid(name: str) -> str:
@@ -32,3 +118,63 @@ class Lock:
         r = random.Random()
         r.seed(name)
         return str(id.UUID(int=r.getrandbits(128)))
+
+
+class LocalLock:
+    """
+    In-process lock with the same interface as Lock, for the local
+    coordination backend
+    """
+
+    def __init__(self, client: LocalClient, name: str):
+        """
+        @param client: Local coordination client
+        @param name: Name of the resource to lock
+        """
+        self.lock = client.lock(name)
+        self.held = False
+
+    def __enter__(self) -> "LocalLock":
+        self.acquire()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.release()
+
+    def acquire(self, blocking: bool = True, timeout: float = None) -> bool:
+        """
+        Acquire lock
+
+        @param blocking: Whether to wait for the lock to be released
+        @param timeout: Maximum seconds to wait, forever if None
+        @return: True if the lock was acquired, False otherwise
+        """
+        self.held = self.lock.acquire(blocking, -1 if timeout is None else timeout)
+        return self.held
+
+    def release(self) -> bool:
+        """
+        Release lock, if it is held by this instance
+        """
+        if not self.held:
+            return False
+        self.held = False
+        self.lock.release()
+        return True
+
+
+class LockBuilder:
+    """
+    Build the lock matching a coordination client
+    """
+
+    @staticmethod
+    def build(client: any, name: str) -> any:
+        """
+        @param client: Redis client or local coordination client
+        @param name: Name of the resource to lock
+        @return: Lock or LocalLock instance
+        """
+        if isinstance(client, LocalClient):
+            return LocalLock(client=client, name=name)
+        return Lock(client=client, name=name)
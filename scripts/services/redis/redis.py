@@ -1,9 +1,10 @@
 import constants
 import redis
-import os
 import pathlib
+import subprocess
 import sys
-import uuid
+import threading
+import time
 
 
 # Added to make the utils module available to the script
@@ -13,35 +14,98 @@ from scripts.utils.process import SubprocessService
 from scripts.utils.errors import ServiceAlreadyRunningError, ServiceNotRunningError
 
 
+class MeteredConnectionPool(redis.BlockingConnectionPool):
+    """
+    Blocking connection pool that keeps count of connections in use
+    """
+
+    def __init__(self, *args, **kwargs):
+        self.in_use = 0
+        self.metrics_lock = threading.Lock()
+        super().__init__(*args, **kwargs)
+
+    def get_connection(self, *args, **kwargs):
+        connection = super().get_connection(*args, **kwargs)
+        with self.metrics_lock:
+            self.in_use += 1
+        return connection
+
+    def release(self, connection) -> None:
+        with self.metrics_lock:
+            self.in_use -= 1
+        super().release(connection)
+
+
 class RedisService:
+    name = "Redis"
+    # Process-wide connection pool shared by every client
+    pool = None
+    pool_lock = threading.Lock()
+
     def __init__(self, password: str):
         self.password = password
+        # Shared client used for health checks
+        self.health_client = redis.StrictRedis(
+            **self.connection_opts(),
+            socket_connect_timeout=constants.REDIS_PING_TIMEOUT,
+            socket_timeout=constants.REDIS_PING_TIMEOUT,
+        )
+        # Cached result of the last health check
+        self.health = None
+        self.health_checked = 0.0
+        self.health_lock = threading.Lock()
+
+    def connection_opts(self) -> dict:
+        """
+        Connection options shared by the pool and the health check client
+        """
+        return {
+            "host": constants.REDIS_HOST,
+            "port": constants.REDIS_PORT,
+            "username": constants.REDIS_USERNAME,
+            "password": self.password,
+            "encoding_errors": constants.REDIS_ERRORS,
+            "encoding": constants.REDIS_CHARSET,
+            "decode_responses": True,
+            "db": 0,
+        }
+
+    def connection_pool(self) -> MeteredConnectionPool:
+        """
+        Get the process-wide connection pool, creating it on first use
+        """
+        with RedisService.pool_lock:
+            if RedisService.pool is None:
+                RedisService.pool = MeteredConnectionPool(
+                    max_connections=constants.REDIS_POOL_SIZE,
+                    timeout=constants.REDIS_POOL_TIMEOUT,
+                    **self.connection_opts(),
+                )
+            return RedisService.pool
+
+    def pool_stats(self) -> dict:
+        """
+        @return: Size of the connection pool and number of connections in use
+        """
+        pool = self.connection_pool()
+        return {"size": pool.max_connections, "in_use": pool.in_use}
 
     def connect(self) -> redis.StrictRedis:
         """
         Connect to redis through python client
         """
         # Check if Redis is running
-        if not RedisService.status():
+        if not self.status():
             raise ServiceNotRunningError("Redis")
-        # Return Redis client
-        return redis.StrictRedis(
-            host=constants.REDIS_HOST,
-            port=constants.REDIS_PORT,
-            username=constants.REDIS_USERNAME,
-            password=self.password,
-            errors=constants.REDIS_ERRORS,
-            charset=constants.REDIS_CHARSET,
-            decode_responses=True,
-            db=0,
-        )
+        # Return Redis client backed by the shared pool
+        return redis.StrictRedis(connection_pool=self.connection_pool())
 
     def flush(self) -> None:
         """
         Flush Redis database
         """
         # Make sure Redis is running
-        if not RedisService.status():
+        if not self.status():
             raise ServiceNotRunningError("Redis")
         try:
             self.connect().flushall()
@@ -61,13 +125,14 @@ class RedisService:
                 [f"docker volume rm {constants.REDIS_DATA_DIR}"],
                 {"stdout": log, "stderr": log, "shell": True},
             ).call()
+        self.invalidate()
 
     def init(self) -> None:
         """
         Start the Redis service through Docker
         """
         # Make sure Redis is not running
-        if RedisService.status():
+        if self.status(refresh=True):
             raise ServiceAlreadyRunningError("Redis")
         # Create docker volume for Redis data
         with open(f"{constants.REDIS_LOG_FILE}", "w") as log:
@@ -88,25 +153,53 @@ class RedisService:
                 ],
                 {"stdout": log, "stderr": log, "shell": True},
             ).call()
+        self.invalidate()
+
+    def status(self, refresh: bool = False) -> bool:
+        """
+        Check if Redis is running. Answers from a cached health state that is
+        refreshed with a PING every REDIS_STATUS_TTL seconds, and only falls
+        back to inspecting the Docker container when the PING fails.
+
+        @param refresh: Whether to ignore the cached health state
+        """
+        with self.health_lock:
+            if (
+                not refresh
+                and self.health is not None
+                and time.monotonic() - self.health_checked < constants.REDIS_STATUS_TTL
+            ):
+                return self.health
+            try:
+                self.health = bool(self.health_client.ping())
+            except redis.exceptions.RedisError:
+                self.health = RedisService.inspect()
+            self.health_checked = time.monotonic()
+            return self.health
+
+    def invalidate(self) -> None:
+        """
+        Drop cached health state, e.g. after starting or stopping the container
+        """
+        with self.health_lock:
+            self.health = None
 
     @staticmethod
-    def status() -> bool:
+    def inspect() -> bool:
         """
-        Check if Redis is running
+        Check if the Redis container is running through Docker
         """
-        filename = f"{constants.REDIS_STATUS_TMP}_{uuid.uuid4()}"
-        with open(filename, "w") as log:
-            SubprocessService(
+        try:
+            output = SubprocessService(
                 [
-                    "docker inspect -f '{{.State.Running}}' "
-                    + f"{constants.REDIS_CONTAINER_NAME}"
+                    "docker",
+                    "inspect",
+                    "-f",
+                    "{{.State.Running}}",
+                    constants.REDIS_CONTAINER_NAME,
                 ],
-                {"stdout": log, "stderr": log, "shell": True},
-            ).call()
-        with open(filename, "r") as log:
-            status = log.read().strip()
-        # Remove temporary file
-        os.remove(filename)
-        if status == "true":
-            return True
-        return False
+                {"stdout": subprocess.PIPE, "stderr": subprocess.DEVNULL},
+            ).run()
+        except FileNotFoundError:
+            return False  # Docker is not installed
+        return output.filter() == "true"
@@ -1,10 +1,21 @@
 import constants
+import contextlib
+import httpx
+import threading
+import urllib3
 
 from . import configuration, vault
 from .redis import lock as lk
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
+from selenium.common.exceptions import (
+    InvalidSessionIdException,
+    JavascriptException,
+    NoSuchWindowException,
+    WebDriverException,
+)
+from scripts.utils.timer import PhaseTimer
 
 
 class ScraperEngine:
@@ -18,6 +29,7 @@ class ScraperEngine:
         options: Options,
         driver: webdriver.Chrome = None,
         headed_support: bool = True,
+        http_client: httpx.Client = None,
     ):
         """
         Create scraper engine instance.
@@ -25,24 +37,29 @@ class ScraperEngine:
         @param options: Options to pass to Chrome driver
         @param driver: Existing Chrome driver instance
         @param headed_support: Whether system supports headed mode
+        @param http_client: Shared HTTP client for HTTP only platforms
         """
         self.options = options
         self.driver = driver
+        self.pooled = False
         self.service = Service(executable_path=constants.CHROME_DRIVER_EXECUTABLE)
         self.headed_support = headed_support
+        self.http_client = http_client
 
     def __getattribute__(self, __name: str) -> any:
         if __name != "service":
             return super().__getattribute__(__name)
 
-    def create_driver(self, custom_driver: any = None) -> None:
+    def create_driver(self, custom_driver: any = None, pooled: bool = False) -> None:
         """
         Create Chrome driver instance.
 
         @param custom_driver: Optional custom driver
+        @param pooled: Whether the custom driver is leased from a driver pool
         """
         if custom_driver:
             self.driver = custom_driver
+            self.pooled = pooled
         else:
             self.driver = webdriver.Chrome(options=self.options, service=self.service)
 
@@ -50,29 +67,36 @@ class ScraperEngine:
         self,
         config: configuration.ConfigurationContainer = None,
         auth_engine: any = None,
+        timer: PhaseTimer = None,
     ) -> None:
         """
         Run scraper on a given URL with a config.
 
         @param config: Configuration object for scraper containing the platform, cookies, etc.
         @param auth_engine: Optional authentication engine to use for authentication
+        @param timer: Optional timer to record scrape phase durations in
         @return Scraped data for platform
         """
-        lock = lk.Lock(client=config.redis, name=config.platform.name)
+        if config.platform.http_only:
+            # Static HTML platforms need neither a driver nor authentication
+            print(f"Fetching {config.platform.url}...")
+            return config.platform.fetch_wrapper(client=self.http_client, timer=timer)
         print(f"Scraping {config.platform.url}...")
-        config.inject_driver(driver=self.driver)
-        while True:
-            if lock.acquire():
-                # Check if authenticated
-                if not vault.VaultService.isAuthenticated(
+        config.inject_driver(driver=self.driver, pooled=self.pooled)
+        # Only take the platform lock when authentication is actually needed
+        if not vault.VaultService.isAuthenticatedCached(
+            config.platform, headed_support=auth_engine.headed_support
+        ):
+            with lk.LockBuilder.build(client=config.redis, name=config.platform.name):
+                # Re-check, another worker may have authenticated meanwhile
+                if not vault.VaultService.isAuthenticatedCached(
                     config.platform, headed_support=auth_engine.headed_support
                 ):
                     vault.VaultService.authenticate(
                         config.platform, auth_engine=auth_engine
                     )
-                lock.release()
-                break
-        return config.platform.scrape_wrapper()
+                    vault.VaultService.setAuthenticated(config.platform)
+        return config.platform.scrape_wrapper(timer=timer)
 
 
 class ScraperBuilder:
@@ -116,15 +140,202 @@ class ScraperBuilder:
         opts: list[str] = [],
         delay_driver_build: bool = False,
         headed_support: bool = True,
+        http_client: httpx.Client = None,
     ) -> ScraperEngine:
         """
         Scraper engine factory build method.
 
         @param opts: List of options to add to Chrome driver
+        @param http_client: Shared HTTP client for HTTP only platforms
         @return: ScraperEngine instance
         """
         options = self.setup_options(default=not bool(opts), opts=opts)
-        engine = ScraperEngine(options=options, headed_support=headed_support)
+        engine = ScraperEngine(
+            options=options, headed_support=headed_support, http_client=http_client
+        )
         if not delay_driver_build:
             engine.create_driver()
         return engine
+
+
+class DriverPool:
+    """
+    Bounded pool of warm Chrome driver instances. Drivers are leased to
+    workers, reset between leases, and recycled after a fixed number of
+    uses or when they crash.
+
+    Example usage:
+    pool = DriverPool(builder=ScraperBuilder())
+    with pool.lease() as driver:
+        driver.get("<url>")
+    pool.shutdown()
+    """
+
+    # Errors raised once the browser or its driver session is gone
+    CRASH_ERRORS = (
+        InvalidSessionIdException,
+        NoSuchWindowException,
+        urllib3.exceptions.HTTPError,  # Chromedriver stopped answering
+        ConnectionError,
+    )
+
+    def __init__(
+        self,
+        builder: ScraperBuilder,
+        size: int = constants.DRIVER_POOL_SIZE,
+        max_uses: int = constants.DRIVER_POOL_MAX_USES,
+        opts: list[str] = [],
+    ):
+        """
+        Create driver pool instance. Drivers are created lazily on lease.
+
+        @param builder: Scraper builder used to create new drivers
+        @param size: Maximum number of live drivers
+        @param max_uses: Number of leases after which a driver is recycled
+        @param opts: List of options to add to Chrome driver
+        """
+        self.builder = builder
+        self.size = size
+        self.max_uses = max_uses
+        self.opts = opts
+        self.idle = []  # Warm drivers waiting to be leased
+        self.uses = {}  # Lease count per driver
+        self.live = 0  # Number of drivers created and not yet recycled
+        self.closed = False
+        self.condition = threading.Condition()
+
+    def create(self) -> webdriver.Chrome:
+        """
+        Create a new Chrome driver through the scraper builder.
+        """
+        return self.builder.build(opts=self.opts).driver
+
+    def acquire(self) -> webdriver.Chrome:
+        """
+        Lease a driver from the pool, blocking until one is available.
+
+        @return: Chrome driver instance
+        """
+        with self.condition:
+            while not self.idle and self.live >= self.size and not self.closed:
+                self.condition.wait()
+            if self.closed:
+                raise RuntimeError("Driver pool is shut down")
+            if self.idle:
+                return self.idle.pop()
+            self.live += 1
+        try:
+            driver = self.create()
+        except Exception:
+            with self.condition:
+                self.live -= 1
+                self.condition.notify()
+            raise
+        with self.condition:
+            self.uses[driver] = 0
+        return driver
+
+    def release(self, driver: webdriver.Chrome, broken: bool = False) -> None:
+        """
+        Return a leased driver to the pool. The driver is reset before it can
+        be leased again, and recycled if it is broken or worn out.
+
+        @param driver: Chrome driver instance to return
+        @param broken: Whether the lease ended with a driver crash
+        """
+        with self.condition:
+            self.uses[driver] = self.uses.get(driver, 0) + 1
+            recycle = broken or self.closed or self.uses[driver] >= self.max_uses
+        if not recycle:
+            recycle = not DriverPool.reset(driver)
+        with self.condition:
+            if recycle:
+                self.uses.pop(driver, None)
+                self.live -= 1
+            else:
+                self.idle.append(driver)
+            self.condition.notify()
+        if recycle:
+            DriverPool.quit(driver)
+
+    @contextlib.contextmanager
+    def lease(self):
+        """
+        Context manager around acquire() and release(). Drivers that lose
+        their browser session during the lease, directly or wrapped in another
+        error such as AutoServiceError, are treated as crashed. Other scrape
+        errors keep the driver, release() resets it before its next lease.
+        """
+        driver = self.acquire()
+        broken = False
+        try:
+            yield driver
+        except Exception as e:
+            broken = DriverPool.crashed(e)
+            raise
+        finally:
+            self.release(driver, broken=broken)
+
+    def shutdown(self) -> None:
+        """
+        Quit all idle drivers. Leased drivers are quit when they are released.
+        """
+        with self.condition:
+            self.closed = True
+            drivers, self.idle = self.idle, []
+            for driver in drivers:
+                self.uses.pop(driver, None)
+            self.live -= len(drivers)
+            self.condition.notify_all()
+        for driver in drivers:
+            DriverPool.quit(driver)
+
+    @staticmethod
+    def crashed(e: BaseException) -> bool:
+        """
+        @param e: Error raised during a lease
+        @return: True if e, or an error it was raised from, means the browser
+            session is gone. Page errors such as timeouts and missing elements
+            leave the driver usable.
+        """
+        while e is not None:
+            if isinstance(e, DriverPool.CRASH_ERRORS):
+                return True
+            e = e.__cause__
+        return False
+
+    @staticmethod
+    def reset(driver: webdriver.Chrome) -> bool:
+        """
+        Close extra tabs and clear browser state left behind by a lease.
+
+        @param driver: Chrome driver instance to reset
+        @return: True if the driver is still usable, False otherwise
+        """
+        try:
+            handles = driver.window_handles
+            for handle in handles[1:]:
+                driver.switch_to.window(handle)
+                driver.close()
+            driver.switch_to.window(handles[0])
+            try:
+                driver.execute_script(
+                    "window.localStorage.clear(); window.sessionStorage.clear();"
+                )
+            except JavascriptException:
+                pass  # Page has no storage access (e.g. about:blank)
+            driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+            driver.get("about:blank")
+        except WebDriverException:
+            return False
+        return True
+
+    @staticmethod
+    def quit(driver: webdriver.Chrome) -> None:
+        """
+        Quit driver, ignoring drivers that already crashed.
+        """
+        try:
+            driver.quit()
+        except WebDriverException:
+            pass
@@ -0,0 +1,66 @@
+import constants
+import importlib
+import os
+
+
+class StoreBuilder:
+    """
+    Build job application store instances
+    """
+
+    # Backend -> (module, class), imported on build so pandas loads on first use
+    stores = {
+        "columnar": ("scripts.services.stores.columnar", "ColumnarStore"),
+        "sqlite": ("scripts.services.stores.sqlite", "SqliteStore"),
+    }
+
+    # Backend -> files whose presence means the store exists
+    paths = {
+        "columnar": [constants.STORE_SNAPSHOT, constants.SOURCE_CSV],
+        "sqlite": [constants.STORE_DB, constants.SOURCE_CSV],
+    }
+
+    @staticmethod
+    def build(backend: str = constants.STORAGE_BACKEND):
+        """
+        Build store instance for backend
+        """
+        try:
+            module, name = StoreBuilder.stores[backend.lower()]
+        except KeyError:
+            raise ValueError(
+                f"Unknown storage backend {backend!r}, "
+                + f"expected one of: {', '.join(StoreBuilder.stores)}"
+            )
+        return getattr(importlib.import_module(module), name)()
+
+
+class LazyStore:
+    """
+    Store that is only built on first use. exists() is answered from the
+    file system, so paths that never read or write job applications don't
+    pay for importing pandas.
+
+    Example usage:
+    store = LazyStore()
+    if store.exists():
+        df = store.load()  # Builds the store
+    """
+
+    def __init__(self, backend: str = constants.STORAGE_BACKEND):
+        self.backend = backend.lower()
+        self.store = None
+
+    def exists(self) -> bool:
+        if self.store is None and self.backend in StoreBuilder.paths:
+            return any(map(os.path.isfile, StoreBuilder.paths[self.backend]))
+        return self.__getattr__("exists")()  # Unknown backends fail in build()
+
+    def flush(self) -> None:
+        if self.store is not None:  # Nothing to export if it was never used
+            self.store.flush()
+
+    def __getattr__(self, name: str) -> any:
+        if self.store is None:
+            self.store = StoreBuilder.build(self.backend)
+        return getattr(self.store, name)
@@ -0,0 +1,448 @@
+import constants
+import contextlib
+import fcntl
+import json
+import os
+import pandas as pd
+import pathlib
+import pickle
+import sys
+
+# Make the store module available to the script
+sys.path.append(f"{pathlib.Path(__file__).parent.resolve()}/../..")
+
+from scripts.models import schema
+from scripts.models.stats import Stats
+from scripts.models.store import Store
+from scripts.utils.dedup import DedupIndex
+from scripts.utils.errors import StoreConflictError
+
+
+class ColumnarStore(Store):
+    """
+    Job application store made of a binary snapshot of the whole table plus
+    an append-only change log. Reads load the snapshot and replay the log,
+    writes append one log record, and the log is folded into a new snapshot
+    once it grows past STORE_COMPACT_THRESHOLD records.
+
+    The CSV file at SOURCE_CSV is still the import/export format. Writes
+    don't rewrite it: it is exported on compaction and by flush(), which
+    trapp calls before it exits. It is imported when no snapshot exists or
+    when it was changed outside trapp since the last export. An outside
+    change is refused while the log holds changes that were never
+    exported, since importing it would drop them.
+
+    The change log doubles as a write-ahead journal. Writers hold an
+    exclusive lock on STORE_LOCK, catch up on records other processes
+    appended, then write and fsync a single record per call, so a batch of
+    entries is one durable write and concurrent trapp processes never
+    interleave or lose records.
+    """
+
+    name = "columnar"
+
+    def __init__(
+        self,
+        snapshot_path: str = constants.STORE_SNAPSHOT,
+        log_path: str = constants.STORE_LOG,
+        csv_path: str = constants.SOURCE_CSV,
+        lock_path: str = constants.STORE_LOCK,
+        sort_index_path: str = constants.STORE_SORT_INDEX,
+    ):
+        """
+        @param snapshot_path: Path of the binary snapshot
+        @param log_path: Path of the change log
+        @param csv_path: Path of the CSV file to import from and export to
+        @param lock_path: Path of the writer lock file
+        @param sort_index_path: Path of the persisted sort indexes
+        """
+        self.snapshot_path = snapshot_path
+        self.log_path = log_path
+        self.csv_path = csv_path
+        self.lock_path = lock_path
+        self.sort_index_path = sort_index_path
+        self.frame = None  # Loaded table, indexed by row id
+        self.dedup = None  # Dedup index over the loaded table
+        self.aggregates = None  # Funnel stats over the loaded table
+        self.csv_mtime = None  # CSV modification time the snapshot matches
+        self.snapshot_mtime = None  # Modification time of the loaded snapshot
+        self.log_records = 0  # Records in the change log
+        self.log_offset = 0  # Bytes of the change log applied to the table
+        self.pending = 0  # Change records not yet exported to CSV
+        self.lock_depth = 0  # Nesting depth of locked()
+        self.sort_indexes = {}  # Column -> sorted row positions, for this version
+        self.sort_version = None
+
+    def exists(self) -> bool:
+        return os.path.isfile(self.snapshot_path) or os.path.isfile(self.csv_path)
+
+    def init(self) -> None:
+        with self.locked():
+            self.frame = ColumnarStore.empty_frame()
+            self.dedup = DedupIndex()
+            self.aggregates = Stats()
+            self.compact()
+
+    def load(self) -> pd.DataFrame:
+        """
+        Load all job applications, indexed by row id. The returned DataFrame
+        is shared with the store and must not be modified in place.
+        """
+        if self.frame is None:
+            with self.locked():
+                pass  # Loaded by sync()
+        return self.frame
+
+    def append(self, df: pd.DataFrame) -> list[int]:
+        rows = schema.format_frame(schema.apply(df))
+        rows = rows.where(pd.notna(rows), None)
+        with self.locked():
+            # Row ids are assigned after catching up with other writers
+            frame = self.load()
+            start = int(frame.index.max()) + 1 if len(frame.index) else 0
+            row_ids = list(range(start, start + len(df.index)))
+            record = {
+                "op": "append",
+                "rows": [
+                    {"id": row_id, "values": dict(zip(constants.COLUMN_NAMES, values))}
+                    for row_id, values in zip(row_ids, rows.values.tolist())
+                ],
+            }
+            self.write(record)
+        return row_ids
+
+    def append_new(self, df: pd.DataFrame) -> tuple[list[int], list[str]]:
+        with self.locked():
+            return super().append_new(df)
+
+    def update(self, row_id: int, values: dict) -> None:
+        with self.locked():
+            self.write(
+                {
+                    "op": "update",
+                    "id": int(row_id),
+                    "values": schema.format_values(schema.check_values(values)),
+                }
+            )
+
+    def delete(self, row_id: int) -> None:
+        with self.locked():
+            self.write({"op": "delete", "id": int(row_id)})
+
+    def dedup_index(self) -> DedupIndex:
+        self.load()
+        return self.dedup
+
+    def stats(self) -> Stats:
+        self.load()
+        return self.aggregates
+
+    def sort_index(self, column: str) -> list[int]:
+        """
+        Sorted row positions for column, reused across runs until the store
+        changes. Indexes are kept next to the snapshot and keyed by the
+        snapshot and change log versions.
+        """
+        self.load()
+        version = self.version()
+        if self.sort_version != version:
+            self.sort_indexes, self.sort_version = {}, version
+            try:
+                with open(self.sort_index_path, "rb") as f:
+                    state = pickle.load(f)
+                if state["version"] == version:
+                    self.sort_indexes = state["indexes"]
+            except (OSError, pickle.UnpicklingError, EOFError, KeyError):
+                pass
+        if column not in self.sort_indexes:
+            self.sort_indexes[column] = super().sort_index(column)
+            tmp_path = f"{self.sort_index_path}.tmp"
+            with open(tmp_path, "wb") as f:
+                pickle.dump(
+                    {"version": version, "indexes": self.sort_indexes},
+                    f,
+                    protocol=pickle.HIGHEST_PROTOCOL,
+                )
+            os.replace(tmp_path, self.sort_index_path)
+        return self.sort_indexes[column]
+
+    def version(self) -> tuple[int, int]:
+        """
+        @return: Modification time of the snapshot and size of the change log
+        """
+        snapshot = os.stat(self.snapshot_path).st_mtime_ns
+        log = os.stat(self.log_path).st_size if os.path.isfile(self.log_path) else 0
+        return (snapshot, log)
+
+    def flush(self) -> None:
+        with self.locked():
+            if self.pending:
+                self.export()
+
+    def export_csv(self, path: str = None) -> None:
+        path = path or self.csv_path
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            schema.to_csv(self.load(), f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+    @contextlib.contextmanager
+    def locked(self):
+        """
+        Hold the writer lock and bring the loaded table up to date with
+        records written by other processes
+        """
+        if self.lock_depth:
+            # Already held by this store
+            self.lock_depth += 1
+            try:
+                yield
+            finally:
+                self.lock_depth -= 1
+            return
+        pathlib.Path(self.lock_path).parent.mkdir(parents=True, exist_ok=True)
+        with open(self.lock_path, "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            self.lock_depth = 1
+            try:
+                self.sync()
+                yield
+            finally:
+                self.lock_depth = 0
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def sync(self) -> None:
+        """
+        Catch up with the snapshot and change log on disk
+        """
+        if self.frame is None or self.snapshot_mtime != self.stat_snapshot():
+            # First load, or another process compacted the log
+            self.read_snapshot()
+        self.replay_log()
+        # Drop a torn record left by a crashed writer
+        if os.path.isfile(self.log_path) and (
+            os.stat(self.log_path).st_size > self.log_offset
+        ):
+            os.truncate(self.log_path, self.log_offset)
+        self.sync_csv()
+
+    def sync_csv(self) -> None:
+        """
+        Import the CSV file if it was changed outside trapp since the last
+        export
+        """
+        if not self.csv_changed():
+            return
+        if self.pending:
+            raise StoreConflictError(
+                f"{self.csv_path} was changed outside trapp while "
+                + f"{self.pending} change(s) were not yet exported to it. "
+                + "Move the CSV aside to keep trapp's changes, or delete "
+                + f"{self.log_path} to import the CSV as is."
+            )
+        self.import_csv()
+
+    def write(self, record: dict) -> None:
+        """
+        Apply a record to the loaded table and durably append it to the
+        change log. Must be called while holding the writer lock.
+        """
+        try:
+            self.apply(record)
+            self.log(record)
+        except Exception:
+            self.frame = None  # Reload from disk, dropping the failed record
+            raise
+        if self.log_records >= constants.STORE_COMPACT_THRESHOLD:
+            self.compact()
+
+    def export(self) -> None:
+        """
+        Export the CSV file and log that it matches the loaded table, so
+        later outside changes to it are told apart from this export
+        """
+        self.export_csv()
+        record = {"op": "export", "csv_mtime": os.stat(self.csv_path).st_mtime_ns}
+        self.apply(record)
+        self.log(record)
+
+    def log(self, record: dict) -> None:
+        """
+        Durably append a record to the change log
+        """
+        pathlib.Path(self.log_path).parent.mkdir(parents=True, exist_ok=True)
+        line = (json.dumps(record, default=str) + "\n").encode()
+        with open(self.log_path, "ab") as log:
+            log.write(line)
+            log.flush()
+            os.fsync(log.fileno())
+        self.log_records += 1
+        self.log_offset += len(line)
+
+    def apply(self, record: dict) -> None:
+        """
+        Apply a change log record to the loaded table
+        """
+        if record["op"] == "export":
+            self.csv_mtime = record["csv_mtime"]
+            self.pending = 0
+            return
+        self.pending += 1
+        if record["op"] == "append":
+            rows = schema.apply(
+                pd.DataFrame(
+                    [row["values"] for row in record["rows"]],
+                    index=pd.Index([row["id"] for row in record["rows"]], name="id"),
+                    columns=constants.COLUMN_NAMES,
+                )
+            )
+            self.frame = schema.concat(self.frame, rows)
+            for row in record["rows"]:
+                self.dedup.add(row["id"], row["values"])
+                self.aggregates.add(row["values"])
+        elif record["op"] == "update":
+            if record["id"] not in self.frame.index:
+                return
+            old = self.frame.loc[record["id"]].to_dict()
+            self.dedup.remove(record["id"], old)
+            self.aggregates.remove(old)
+            for column, value in schema.parse_values(record["values"]).items():
+                schema.set_value(self.frame, record["id"], column, value)
+            new = self.frame.loc[record["id"]].to_dict()
+            self.dedup.add(record["id"], new)
+            self.aggregates.add(new)
+        elif record["op"] == "delete":
+            if record["id"] not in self.frame.index:
+                return
+            old = self.frame.loc[record["id"]].to_dict()
+            self.dedup.remove(record["id"], old)
+            self.aggregates.remove(old)
+            self.frame = self.frame.drop(index=record["id"])
+
+    def compact(self, export: bool = True) -> None:
+        """
+        Fold the change log into a new snapshot
+
+        @param export: Whether to export the CSV file too
+        """
+        if export:
+            self.export_csv()
+        self.csv_mtime = self.stat_csv()
+        pathlib.Path(self.snapshot_path).parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = f"{self.snapshot_path}.tmp"
+        with open(tmp_path, "wb") as snapshot:
+            pickle.dump(
+                {
+                    "frame": self.frame,
+                    "csv_mtime": self.csv_mtime,
+                    "dedup": self.dedup,
+                    "stats": self.aggregates,
+                },
+                snapshot,
+                protocol=pickle.HIGHEST_PROTOCOL,
+            )
+            snapshot.flush()
+            os.fsync(snapshot.fileno())
+        os.replace(tmp_path, self.snapshot_path)
+        self.snapshot_mtime = self.stat_snapshot()
+        open(self.log_path, "w").close()  # Truncate change log
+        self.log_records = 0
+        self.log_offset = 0
+        self.pending = 0
+
+    def read_snapshot(self) -> None:
+        """
+        Read the binary snapshot, if any
+        """
+        try:
+            with open(self.snapshot_path, "rb") as snapshot:
+                state = pickle.load(snapshot)
+        except FileNotFoundError:
+            self.frame = ColumnarStore.empty_frame()
+            self.dedup = DedupIndex()
+            self.aggregates = Stats()
+            self.csv_mtime = None
+            self.snapshot_mtime = None
+            self.log_records = 0
+            self.log_offset = 0
+            self.pending = 0
+            return
+        self.frame = state["frame"]
+        if not isinstance(self.frame["Status"].dtype, pd.CategoricalDtype):
+            # Snapshots written before the typed schema are converted once
+            self.frame = schema.apply(self.frame)
+        self.csv_mtime = state["csv_mtime"]
+        # Snapshots written before the dedup index or stats existed are indexed once
+        self.dedup = state.get("dedup") or DedupIndex.build(self.frame)
+        self.aggregates = state.get("stats") or Stats.build(self.frame)
+        self.snapshot_mtime = self.stat_snapshot()
+        self.log_records = 0
+        self.log_offset = 0
+        self.pending = 0
+
+    def replay_log(self) -> None:
+        """
+        Apply the change log records not yet applied to the loaded table
+        """
+        if not os.path.isfile(self.log_path):
+            return
+        with open(self.log_path, "rb") as log:
+            log.seek(self.log_offset)
+            for line in log:
+                if not line.endswith(b"\n"):
+                    break  # Torn last write
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    break
+                self.apply(record)
+                self.log_records += 1
+                self.log_offset += len(line)
+
+    def stat_snapshot(self) -> int:
+        """
+        @return: Modification time of the snapshot, or None if there is none
+        """
+        try:
+            return os.stat(self.snapshot_path).st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def stat_csv(self) -> int:
+        """
+        @return: Modification time of the CSV file, or None if there is none
+        """
+        try:
+            return os.stat(self.csv_path).st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def csv_changed(self) -> bool:
+        """
+        Check if the CSV file was created or changed outside of the store
+        """
+        mtime = self.stat_csv()
+        return mtime is not None and mtime != self.csv_mtime
+
+    def import_csv(self) -> None:
+        """
+        Replace the store contents with the CSV file, leaving the file as is
+        """
+        frame = schema.read_csv(self.csv_path)
+        frame.index = pd.RangeIndex(len(frame.index), name="id")
+        self.frame = frame
+        self.dedup = DedupIndex.build(self.frame)
+        self.aggregates = Stats.build(self.frame)
+        with self.locked():
+            self.compact(export=False)
+
+    @staticmethod
+    def empty_frame() -> pd.DataFrame:
+        return schema.apply(
+            pd.DataFrame(
+                columns=constants.COLUMN_NAMES,
+                index=pd.Index([], name="id", dtype=int),
+            )
+        )
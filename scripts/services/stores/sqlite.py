@@ -0,0 +1,361 @@
+import constants
+import os
+import pandas as pd
+import pathlib
+import sqlite3
+import sys
+import threading
+
+# Make the store module available to the script
+sys.path.append(f"{pathlib.Path(__file__).parent.resolve()}/../..")
+
+from scripts.models import schema
+from scripts.models.stats import Stats, keys as stats_keys
+from scripts.models.store import Store
+from scripts.utils.dedup import row_keys
+
+# SQL column names for constants.COLUMN_NAMES, in order
+COLUMNS = ["company", "position", "date_applied", "status", "portal_link", "notes"]
+COLUMN_MAP = dict(zip(constants.COLUMN_NAMES, COLUMNS))
+KEY_SEPARATOR = "\x1f"  # Joins (company, position) keys
+DUPLICATE_REASONS = {
+    "link": constants.DUPLICATE_LINK,
+    "entry": constants.DUPLICATE_ENTRY,
+}
+
+# Sortable yyyymmdd form of date_applied, which is stored as mm/dd/yyyy
+DATE_KEY = "substr(date_applied, 7, 4) || substr(date_applied, 1, 2) || substr(date_applied, 4, 2)"
+ORDER_KEYS = {**COLUMN_MAP, "Date Applied": DATE_KEY}
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS applications (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    company TEXT,
+    position TEXT,
+    date_applied TEXT,
+    status TEXT,
+    portal_link TEXT,
+    notes TEXT
+);
+CREATE INDEX IF NOT EXISTS applications_company ON applications (company);
+CREATE INDEX IF NOT EXISTS applications_status ON applications (status);
+CREATE INDEX IF NOT EXISTS applications_date_applied ON applications (date_applied);
+CREATE INDEX IF NOT EXISTS applications_date_key ON applications ({DATE_KEY});
+CREATE TABLE IF NOT EXISTS application_keys (
+    id INTEGER NOT NULL,
+    kind TEXT NOT NULL,
+    key TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS application_keys_key ON application_keys (kind, key);
+CREATE INDEX IF NOT EXISTS application_keys_id ON application_keys (id);
+CREATE TABLE IF NOT EXISTS application_stats (
+    kind TEXT NOT NULL,
+    key TEXT NOT NULL,
+    total INTEGER NOT NULL,
+    responded INTEGER NOT NULL,
+    PRIMARY KEY (kind, key)
+);
+CREATE TABLE IF NOT EXISTS csv_export (
+    id INTEGER PRIMARY KEY CHECK (id = 0),
+    changes INTEGER NOT NULL DEFAULT 0,
+    exported INTEGER NOT NULL DEFAULT 0
+);
+"""
+# user_version once application_keys and application_stats are backfilled
+INDEX_VERSION = 2
+
+
+class SqliteStore(Store):
+    """
+    Job application store backed by SQLite. Every row has a stable INTEGER
+    PRIMARY KEY, and Company, Status and Date Applied are indexed, so lookups
+    and writes touch single rows instead of the whole file. The database runs
+    in WAL mode and each append() is one transaction, so a batch of entries
+    is a single durable commit that concurrent trapp processes can't tear.
+
+    An existing job_applications.csv is migrated into the database the first
+    time the store is opened. From then on the database is the source of
+    truth and the CSV is its export. Writes count themselves in csv_export
+    instead of rewriting the CSV, and flush() exports it once for all the
+    writes made since the last export, by any process. Edits made to it
+    outside trapp are not imported.
+    """
+
+    name = "sqlite"
+
+    def __init__(
+        self,
+        db_path: str = constants.STORE_DB,
+        csv_path: str = constants.SOURCE_CSV,
+    ):
+        """
+        @param db_path: Path of the SQLite database
+        @param csv_path: Path of the CSV file to migrate from and export to
+        """
+        self.db_path = db_path
+        self.csv_path = csv_path
+        self.connection = None
+        self.lock = threading.RLock()
+
+    def connect(self) -> sqlite3.Connection:
+        """
+        Open the database, creating the schema and migrating the CSV file if needed
+        """
+        if self.connection is None:
+            migrate = not os.path.isfile(self.db_path)
+            pathlib.Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+            self.connection = sqlite3.connect(
+                self.db_path,
+                timeout=constants.STORE_LOCK_TIMEOUT,  # Wait for other trapp processes
+                check_same_thread=False,
+            )
+            # Write-ahead journal, synced on every commit
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute("PRAGMA synchronous=FULL")
+            self.connection.executescript(SCHEMA)
+            if migrate and os.path.isfile(self.csv_path):
+                self.import_csv()
+            elif self.connection.execute("PRAGMA user_version").fetchone()[0] < INDEX_VERSION:
+                # Databases created before application_keys or application_stats
+                # are indexed once
+                with self.lock, self.connection as connection:
+                    connection.execute("DELETE FROM application_keys")
+                    connection.execute("DELETE FROM application_stats")
+                    for row_id, *values in connection.execute(
+                        "SELECT * FROM applications"
+                    ).fetchall():
+                        self.index_row(
+                            connection,
+                            row_id,
+                            dict(zip(constants.COLUMN_NAMES, values)),
+                        )
+            self.connection.execute(f"PRAGMA user_version = {INDEX_VERSION}")
+        return self.connection
+
+    def exists(self) -> bool:
+        return os.path.isfile(self.db_path) or os.path.isfile(self.csv_path)
+
+    def init(self) -> None:
+        self.connect()
+        self.export_csv()
+
+    def load(self) -> pd.DataFrame:
+        return self.query("SELECT * FROM applications ORDER BY id")
+
+    def find(self, column: str, value: str) -> pd.DataFrame:
+        return self.query(
+            f"SELECT * FROM applications WHERE {COLUMN_MAP[column]} = ? ORDER BY id",
+            (value,),
+        )
+
+    def count(self) -> int:
+        with self.lock:
+            return self.connect().execute("SELECT COUNT(*) FROM applications").fetchone()[0]
+
+    def iter_pages(self, page_size: int, sort_by: str = None):
+        """
+        Yield job applications one page at a time. Sorting on Company, Status
+        or Date Applied walks the matching index instead of sorting in memory.
+        """
+        order = f"{ORDER_KEYS[sort_by]}, id" if sort_by else "id"
+        offset = 0
+        while True:
+            page = self.query(
+                f"SELECT * FROM applications ORDER BY {order} LIMIT ? OFFSET ?",
+                (page_size, offset),
+            )
+            if not len(page.index):
+                return
+            yield page
+            offset += page_size
+
+    def duplicates(self, df: pd.DataFrame) -> list[str]:
+        reasons = []
+        seen = set()  # Keys of earlier rows in df
+        with self.lock:
+            connection = self.connect()
+            for values in df.to_dict("records"):
+                reason = None
+                keys = SqliteStore.keys(values)
+                for kind, key in keys:
+                    if (kind, key) in seen or connection.execute(
+                        "SELECT 1 FROM application_keys WHERE kind = ? AND key = ? LIMIT 1",
+                        (kind, key),
+                    ).fetchone():
+                        reason = DUPLICATE_REASONS[kind]
+                        break
+                if reason is None:
+                    seen.update(keys)
+                reasons.append(reason)
+        return reasons
+
+    def get(self, row_id: int) -> pd.Series:
+        df = self.query("SELECT * FROM applications WHERE id = ?", (int(row_id),))
+        return df.iloc[0] if len(df.index) else None
+
+    def append(self, df: pd.DataFrame) -> list[int]:
+        with self.lock, self.connect() as connection:
+            row_ids = self.insert(connection, df)
+            self.changed(connection)
+        return row_ids
+
+    def append_new(self, df: pd.DataFrame) -> tuple[list[int], list[str]]:
+        with self.lock, self.connect() as connection:
+            # Take the write lock before the check, not at the first INSERT
+            connection.execute("BEGIN IMMEDIATE")
+            reasons = self.duplicates(df)
+            new = df.loc[[reason is None for reason in reasons]]
+            row_ids = self.insert(connection, new) if len(new.index) else []
+            if row_ids:
+                self.changed(connection)
+        return row_ids, reasons
+
+    def insert(self, connection: sqlite3.Connection, df: pd.DataFrame) -> list[int]:
+        """
+        Insert job applications in the current transaction, without
+        exporting the CSV file
+
+        @return: Row ids assigned to the new rows
+        """
+        rows = schema.format_frame(schema.apply(df))
+        rows = rows.where(pd.notna(rows), None)
+        row_ids = []
+        for values in rows.values.tolist():
+            cursor = connection.execute(
+                f"INSERT INTO applications ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})",
+                [str(v) if v is not None else None for v in values],
+            )
+            row_ids.append(cursor.lastrowid)
+            self.index_row(
+                connection,
+                cursor.lastrowid,
+                dict(zip(constants.COLUMN_NAMES, values)),
+            )
+        return row_ids
+
+    def update(self, row_id: int, values: dict) -> None:
+        values = schema.format_values(schema.check_values(values))
+        assignments = ", ".join(f"{COLUMN_MAP[column]} = ?" for column in values)
+        with self.lock, self.connect() as connection:
+            row = self.get(row_id)
+            if row is None:
+                return
+            self.unindex_row(connection, int(row_id), row.to_dict())
+            connection.execute(
+                f"UPDATE applications SET {assignments} WHERE id = ?",
+                [*values.values(), int(row_id)],
+            )
+            self.index_row(connection, int(row_id), self.get(row_id).to_dict())
+            self.changed(connection)
+
+    def delete(self, row_id: int) -> None:
+        with self.lock, self.connect() as connection:
+            row = self.get(row_id)
+            if row is None:
+                return
+            self.unindex_row(connection, int(row_id), row.to_dict())
+            connection.execute("DELETE FROM applications WHERE id = ?", (int(row_id),))
+            self.changed(connection)
+
+    def stats(self) -> Stats:
+        aggregates = Stats()
+        with self.lock:
+            for kind, key, total, responded in self.connect().execute(
+                "SELECT kind, key, total, responded FROM application_stats"
+            ):
+                aggregates.counts[(kind, key)] = [total, responded]
+        return aggregates
+
+    def changed(self, connection: sqlite3.Connection) -> None:
+        """
+        Count a write in the current transaction, for flush()
+        """
+        connection.execute(
+            "INSERT INTO csv_export (id, changes) VALUES (0, 1) "
+            + "ON CONFLICT (id) DO UPDATE SET changes = changes + 1"
+        )
+
+    def flush(self) -> None:
+        with self.lock, self.connect() as connection:
+            # Hold the write lock, so no write lands between export and mark
+            connection.execute("BEGIN IMMEDIATE")
+            row = connection.execute(
+                "SELECT changes, exported FROM csv_export"
+            ).fetchone()
+            if row is not None and row[0] != row[1]:
+                self.export_csv()
+                connection.execute("UPDATE csv_export SET exported = changes")
+
+    def export_csv(self, path: str = None) -> None:
+        """
+        Export all job applications to CSV
+        """
+        path = path or self.csv_path
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        schema.to_csv(self.load(), tmp_path)
+        os.replace(tmp_path, path)
+
+    def import_csv(self) -> None:
+        """
+        Copy every row of the CSV file into the database
+        """
+        print("Migrating job_applications.csv to SQLite...", end=" ")
+        with self.lock, self.connect() as connection:
+            self.insert(connection, schema.read_csv(self.csv_path))
+        print(f"{constants.OKGREEN}OK{constants.ENDC}")
+
+    def index_row(
+        self, connection: sqlite3.Connection, row_id: int, values: dict
+    ) -> None:
+        """
+        Index the portal link and (company, position) key of a row, and
+        count it in the funnel stats
+        """
+        connection.executemany(
+            "INSERT INTO application_keys (id, kind, key) VALUES (?, ?, ?)",
+            [(row_id, kind, key) for kind, key in SqliteStore.keys(values)],
+        )
+        connection.executemany(
+            """INSERT INTO application_stats (kind, key, total, responded)
+            VALUES (?, ?, 1, ?)
+            ON CONFLICT (kind, key) DO UPDATE SET
+                total = total + 1, responded = responded + excluded.responded""",
+            [(kind, key, int(r)) for kind, key, r in stats_keys(values)],
+        )
+
+    def unindex_row(
+        self, connection: sqlite3.Connection, row_id: int, values: dict
+    ) -> None:
+        """
+        Undo index_row() for a row about to be updated or deleted
+        """
+        connection.execute("DELETE FROM application_keys WHERE id = ?", (row_id,))
+        connection.executemany(
+            """UPDATE application_stats SET total = total - 1, responded = responded - ?
+            WHERE kind = ? AND key = ?""",
+            [(int(r), kind, key) for kind, key, r in stats_keys(values)],
+        )
+        connection.execute("DELETE FROM application_stats WHERE total <= 0")
+
+    @staticmethod
+    def keys(values: dict) -> list[tuple[str, str]]:
+        """
+        @return: (kind, key) pairs stored in application_keys for a row
+        """
+        link, entry = row_keys(values)
+        keys = []
+        if link:
+            keys.append(("link", link))
+        if entry:
+            keys.append(("entry", KEY_SEPARATOR.join(entry)))
+        return keys
+
+    def query(self, sql: str, params: tuple = ()) -> pd.DataFrame:
+        """
+        Run a SELECT and return its rows indexed by row id, with CSV column names
+        """
+        with self.lock:
+            cursor = self.connect().execute(sql, params)
+            rows = cursor.fetchall()
+        df = pd.DataFrame(rows, columns=["id", *constants.COLUMN_NAMES])
+        return schema.apply(df.set_index("id"))
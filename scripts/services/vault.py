@@ -1,5 +1,6 @@
 import os
 import pathlib
+import threading
 
 import constants
 
@@ -8,6 +9,10 @@ from scripts.utils.errors import *
 
 
 class VaultService:
+    # In-process auth state per Platform.name, kept for the life of a batch
+    auth_state = {}
+    auth_state_lock = threading.Lock()
+
     def __init__(self):
         pass
 
@@ -41,6 +46,38 @@ class VaultService:
             return False
         return True
 
+    @staticmethod
+    def isAuthenticatedCached(
+        platform: platform.Platform, headed_support: bool = True
+    ) -> bool:
+        """
+        Check if user has saved auth state for platform, without touching
+        the filesystem once the platform is known to be authenticated
+        """
+        with VaultService.auth_state_lock:
+            if VaultService.auth_state.get(platform.name):
+                return True
+        if not VaultService.isAuthenticated(platform, headed_support=headed_support):
+            return False
+        VaultService.setAuthenticated(platform)
+        return True
+
+    @staticmethod
+    def setAuthenticated(platform: platform.Platform) -> None:
+        """
+        Mark platform as authenticated in the in-process auth state
+        """
+        with VaultService.auth_state_lock:
+            VaultService.auth_state[platform.name] = True
+
+    @staticmethod
+    def clearAuthState() -> None:
+        """
+        Forget in-process auth state, e.g. at the start of a batch
+        """
+        with VaultService.auth_state_lock:
+            VaultService.auth_state.clear()
+
     @staticmethod
     def authenticate(platform: platform.Platform, auth_engine: any = None) -> None:
         if not auth_engine:
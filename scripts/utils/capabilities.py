@@ -0,0 +1,85 @@
+import constants
+import hashlib
+import json
+import os
+import pathlib
+
+
+class CapabilityCache:
+    """
+    Persisted results of environment probes (GUI support, xvfb, ...). The
+    cache is keyed by a fingerprint of the hostname, kernel and display
+    environment, and is dropped as soon as any of those change, so repeated
+    probes become a single file read.
+
+    Example usage:
+    capabilities = CapabilityCache()
+    gui_support = capabilities.get("has_gui", probe_gui)
+    """
+
+    def __init__(self, path: str = constants.CAPABILITY_CACHE_PATH):
+        """
+        @param path: Path of the cache file on disk
+        """
+        self.path = path
+        self.key = CapabilityCache.fingerprint()
+        self.results = {}
+        self.load()
+
+    @staticmethod
+    def fingerprint() -> str:
+        """
+        @return: Hash of the hostname, kernel and display environment
+        """
+        uname = os.uname()
+        environment = {
+            "hostname": uname.nodename,
+            "kernel": [uname.sysname, uname.release, uname.version, uname.machine],
+            "display": {var: os.getenv(var) for var in constants.CAPABILITY_ENV},
+        }
+        return hashlib.sha256(
+            json.dumps(environment, sort_keys=True).encode()
+        ).hexdigest()
+
+    def load(self) -> None:
+        """
+        Load probe results, ignoring a missing, corrupt or stale file
+        """
+        try:
+            with open(self.path, "r") as f:
+                cached = json.load(f)
+        except (OSError, ValueError):
+            return
+        if isinstance(cached, dict) and cached.get("key") == self.key:
+            self.results = cached.get("results", {})
+
+    def save(self) -> None:
+        """
+        Atomically write probe results to disk
+        """
+        pathlib.Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"key": self.key, "results": self.results}, f)
+        os.replace(tmp_path, self.path)
+
+    def get(self, name: str, probe) -> any:
+        """
+        @param name: Name of the capability
+        @param probe: Function probing the capability, run on a cache miss
+        @return: Cached or freshly probed result
+        """
+        if name not in self.results:
+            self.results[name] = probe()
+            self.save()
+        return self.results[name]
+
+    def invalidate(self, name: str = None) -> None:
+        """
+        Drop one cached capability, or all of them
+        """
+        if name is None:
+            self.results = {}
+        else:
+            self.results.pop(name, None)
+        self.save()
@@ -0,0 +1,120 @@
+import constants
+import pandas as pd
+import urllib.parse
+
+# Query parameters that only track where a link was clicked from
+TRACKING_PARAMS = {"ref", "refid", "trackingid", "src", "source", "trk", "gh_src"}
+
+
+def normalize_link(link: str) -> str:
+    """
+    Normalize a portal link so the same job post always has the same key
+
+    @param link: Portal link, as entered or scraped
+    @return: Lowercased link without scheme, www., fragment, trailing slash
+        or tracking parameters, or None if there is no link
+    """
+    if not isinstance(link, str) or not link.strip():
+        return None
+    parts = urllib.parse.urlsplit(link.strip())
+    if not parts.netloc:  # No scheme given
+        parts = urllib.parse.urlsplit(f"https://{link.strip()}")
+    host = parts.netloc.lower().removeprefix("www.")
+    query = sorted(
+        (key, value)
+        for key, value in urllib.parse.parse_qsl(parts.query)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith("utm_")
+    )
+    key = f"{host}{parts.path.rstrip('/')}"
+    return f"{key}?{urllib.parse.urlencode(query)}" if query else key
+
+
+def entry_key(company: str, position: str) -> tuple[str, str]:
+    """
+    @return: Case and whitespace insensitive (company, position) key, or None
+        if either is missing
+    """
+    if not isinstance(company, str) or not isinstance(position, str):
+        return None
+    key = (" ".join(company.casefold().split()), " ".join(position.casefold().split()))
+    return key if all(key) else None
+
+
+def row_keys(values: dict) -> tuple[str, tuple[str, str]]:
+    """
+    @param values: Job application values, keyed by column name
+    @return: Link key and (company, position) key of the job application
+    """
+    return (
+        normalize_link(values.get("Portal Link")),
+        entry_key(values.get("Company"), values.get("Position")),
+    )
+
+
+class DedupIndex:
+    """
+    Hashed index from normalized portal links and (company, position) keys
+    to the row ids holding them. It is kept up to date one row at a time,
+    so appends, updates and deletes never need a rebuild.
+
+    Example usage:
+    index = DedupIndex.build(store.load())
+    reasons = index.duplicates(df)
+    """
+
+    def __init__(self):
+        self.links = {}  # Link key -> row ids
+        self.entries = {}  # (company, position) key -> row ids
+
+    @staticmethod
+    def build(df: pd.DataFrame) -> "DedupIndex":
+        """
+        @param df: Job applications, indexed by row id
+        @return: Index over every row of df
+        """
+        index = DedupIndex()
+        for row_id, values in zip(df.index, df.to_dict("records")):
+            index.add(row_id, values)
+        return index
+
+    def add(self, row_id: int, values: dict) -> None:
+        link, entry = row_keys(values)
+        if link:
+            self.links.setdefault(link, set()).add(row_id)
+        if entry:
+            self.entries.setdefault(entry, set()).add(row_id)
+
+    def remove(self, row_id: int, values: dict) -> None:
+        link, entry = row_keys(values)
+        for keys, key in ((self.links, link), (self.entries, entry)):
+            if key in keys:
+                keys[key].discard(row_id)
+                if not keys[key]:
+                    del keys[key]
+
+    def lookup(self, values: dict) -> str:
+        """
+        @param values: Job application values, keyed by column name
+        @return: Why the job application is a duplicate, or None if it isn't
+        """
+        link, entry = row_keys(values)
+        if link in self.links:
+            return constants.DUPLICATE_LINK
+        if entry in self.entries:
+            return constants.DUPLICATE_ENTRY
+        return None
+
+    def duplicates(self, df: pd.DataFrame) -> list[str]:
+        """
+        @param df: New job applications
+        @return: Duplicate reason (or None) for each row of df, rows repeated
+            within df included
+        """
+        seen = DedupIndex()
+        reasons = []
+        for i, values in enumerate(df.to_dict("records")):
+            reason = self.lookup(values) or seen.lookup(values)
+            if reason is None:
+                seen.add(i, values)
+            reasons.append(reason)
+        return reasons
@@ -78,6 +78,17 @@ class ServiceNotRunningError(Exception):
         super().__init__(self.msg)
 
 
+class DaemonError(Exception):
+    """
+    Error raised by the trapp daemon while running a client's request. The
+    daemon itself keeps running.
+    """
+
+    def __init__(self, msg) -> None:
+        self.msg = f"trapp daemon: {msg}"
+        super().__init__(self.msg)
+
+
 class AutoServiceError(Exception):
     """
     Wrapper class for errors raised by auto service
@@ -99,6 +110,17 @@ class PoolException(Exception):
         super().__init__()
 
 
+class StoreConflictError(Exception):
+    """
+    Error raised when the CSV file and the job application store both have
+    changes the other is missing.
+    """
+
+    def __init__(self, msg) -> None:
+        self.msg = msg
+        super().__init__(self.msg)
+
+
 def get_error_types() -> any:
     """
     Get error types from errors module
@@ -3,12 +3,90 @@ import constants
 from . import process as sp
 
 
+class GumPrompt:
+    """
+    Prompt backend that runs the gum binary, one process per prompt
+    """
+
+    path = constants.GUM_PATH
+
+    def choose(self, opts: list[str]):
+        return sp.SubprocessService([f"{self.path}", "choose", *opts]).run().filter()
+
+    def input(self, placeholder: str = None, opts: list[str] = None):
+        if placeholder:
+            opts = [f"--placeholder={placeholder}"] + ([*opts] if opts else [])
+        return sp.SubprocessService([f"{self.path}", "input", *(opts or [])]).run().filter()
+
+
+class RichPrompt:
+    """
+    Prompt backend that asks in-process with rich, without spawning anything
+    """
+
+    def __init__(self, stream=None):
+        """
+        @param stream: Stream to read answers from, defaults to stdin
+        """
+        # Imported here so the default gum backend doesn't pay for rich at startup
+        from rich.console import Console
+
+        self.console = Console()
+        self.stream = stream
+
+    def choose(self, opts: list[str]):
+        from rich.prompt import Prompt
+
+        for i, opt in enumerate(opts, start=1):
+            self.console.print(f"  [bold]{i}[/bold]) {opt}", highlight=False)
+        choice = Prompt.ask(
+            "Choose",
+            console=self.console,
+            choices=[str(i) for i in range(1, len(opts) + 1)],
+            show_choices=False,
+            stream=self.stream,
+        )
+        return opts[int(choice) - 1]
+
+    def input(self, placeholder: str = None, opts: list[str] = None):
+        from rich.prompt import Prompt
+
+        if isinstance(placeholder, list):  # Passed positionally as gum opts
+            placeholder = " ".join(placeholder)
+        return Prompt.ask(
+            f"[dim]{placeholder or ''}[/dim]",
+            console=self.console,
+            default="",
+            show_default=False,
+            stream=self.stream,
+        ).strip()
+
+
 class Gum:
     """
-    Wrapper class for the gum binary
+    Wrapper class for the gum binary. Prompts go through the backend picked
+    by constants.PROMPT_BACKEND (or Gum.use()), "gum" or the in-process "rich".
     """
 
     path = constants.GUM_PATH
+    backends = {"gum": GumPrompt, "rich": RichPrompt}
+    backend = None
+
+    @staticmethod
+    def use(backend: str) -> None:
+        """
+        Switch prompt backend
+        @param backend name of the backend, "gum" or "rich"
+        @raise ValueError: For unknown backends
+        """
+        try:
+            prompt = Gum.backends[backend.lower()]
+        except KeyError:
+            raise ValueError(
+                f"Unknown prompt backend {backend!r}, "
+                + f"expected one of: {', '.join(Gum.backends)}"
+            )
+        Gum.backend = prompt()
 
     @staticmethod
     def choose(opts: list[str]):
@@ -17,7 +95,9 @@ class Gum:
         @param opts options to pass onto gum
         @returns the output of gum choose
         """
-        return sp.SubprocessService([f"{Gum.path}", "choose", *opts]).run().filter()
+        if Gum.backend is None:
+            Gum.use(constants.PROMPT_BACKEND)
+        return Gum.backend.choose(opts)
 
     @staticmethod
     def input(placeholder: str = None, opts: list[str] = None):
@@ -26,6 +106,6 @@ class Gum:
         @param opts options to pass onto gum
         @returns the output of gum input
         """
-        if placeholder:
-            opts = [f"--placeholder={placeholder}"] + ([*opts] if opts else [])
-        return sp.SubprocessService([f"{Gum.path}", "input", *opts]).run().filter()
+        if Gum.backend is None:
+            Gum.use(constants.PROMPT_BACKEND)
+        return Gum.backend.input(placeholder, opts)
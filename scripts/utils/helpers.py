@@ -7,19 +7,30 @@ import re
 import subprocess
 
 from . import process as sp
+from .capabilities import CapabilityCache
 
 OPTS = {"stderr": subprocess.DEVNULL, "universal_newlines": True, "shell": True}
 
 
 def has_gui() -> bool:
     """
-    Check if running on a GUI
+    Check if running on a GUI. Probes run once per environment, see
+    CapabilityCache.
 
     @return: True if running on a GUI, False otherwise
     """
     # If system uname -s is Darwin, then we are on macOS
     if os.uname().sysname == "Darwin":
         return True
+    return CapabilityCache().get("has_gui", probe_gui)
+
+
+def probe_gui() -> bool:
+    """
+    Check if running on a GUI by looking for Xorg and desktop sessions
+
+    @return: True if running on a GUI, False otherwise
+    """
     check_xorg = sp.SubprocessService(["type", "Xorg"], OPTS).check_output(output=True)
     if check_xorg == "Xorg is /usr/bin/Xorg\n":
         return True
@@ -48,33 +59,9 @@ def verify_headless_support() -> bool:
     Check if xvfb is installed, if not, install it
     """
     if os.uname().sysname != "Darwin":
-        check_xvfb = ""
         print("Checking for xvfb...", end=" ")
-        try:
-            check_xvfb = sp.SubprocessService(["which xvfb-run"], OPTS).check_output(
-                output=True
-            )
-        except Exception as e:
-            pass
-        if not "/usr/bin/xvfb-run\n" in check_xvfb:
-            print("xvfb not installed, installing...")
-            # Install xvfb
-            sp.SubprocessService(
-                ["sudo", "apt-get", "install", "xvfb"], {"stderr": subprocess.DEVNULL}
-            ).check_call()
-            # Install firefox dependency
-            sp.SubprocessService(
-                ["sudo", "apt-get", "install", "firefox"],
-                {"stderr": subprocess.DEVNULL},
-            ).check_call()
-            # Verify xvfb installation
-            check_xvfb = sp.SubprocessService(["which xvfb-run"], OPTS).check_output(
-                output=True
-            )
-        if not "/usr/bin/xvfb-run\n" in check_xvfb:
-            raise Exception("xvfb installation failed")
-        else:
-            print(f"{constants.OKGREEN}OK{constants.ENDC}")
+        CapabilityCache().get("xvfb", probe_xvfb)
+        print(f"{constants.OKGREEN}OK{constants.ENDC}")
         cache_file_path = pathlib.Path(constants.XVFB_CACHE_FLAG)
         if not cache_file_path.is_file():
             print(
@@ -106,6 +93,37 @@ def verify_headless_support() -> bool:
     return True
 
 
+def probe_xvfb() -> bool:
+    """
+    Check if xvfb-run is on the path, installing xvfb if it isn't
+    """
+    check_xvfb = ""
+    try:
+        check_xvfb = sp.SubprocessService(["which xvfb-run"], OPTS).check_output(
+            output=True
+        )
+    except Exception as e:
+        pass
+    if not "/usr/bin/xvfb-run\n" in check_xvfb:
+        print("xvfb not installed, installing...")
+        # Install xvfb
+        sp.SubprocessService(
+            ["sudo", "apt-get", "install", "xvfb"], {"stderr": subprocess.DEVNULL}
+        ).check_call()
+        # Install firefox dependency
+        sp.SubprocessService(
+            ["sudo", "apt-get", "install", "firefox"],
+            {"stderr": subprocess.DEVNULL},
+        ).check_call()
+        # Verify xvfb installation
+        check_xvfb = sp.SubprocessService(["which xvfb-run"], OPTS).check_output(
+            output=True
+        )
+    if not "/usr/bin/xvfb-run\n" in check_xvfb:
+        raise Exception("xvfb installation failed")
+    return True
+
+
 def get_root_from_url(url: str) -> str:
     """
     Get root domain from URL
@@ -0,0 +1,62 @@
+import constants
+import pandas as pd
+import re
+
+from scripts.models import schema
+
+
+class FuzzyIndex:
+    """
+    In-process fuzzy search index over job entries. A query matches an entry
+    when its characters appear in order in the entry's label. Matches are
+    ranked by how tightly they cluster, and refining a query only rescans
+    the entries that matched the previous one.
+
+    Example usage:
+    index = FuzzyIndex(store.load())
+    row_ids = index.search("goog swe", limit=10)
+    """
+
+    def __init__(self, df: pd.DataFrame, columns: list[str] = None):
+        """
+        @param df: Job entries, indexed by row id
+        @param columns: Columns to search and display, defaults to the first four
+        """
+        columns = columns or constants.COLUMN_NAMES[:4]
+        self.row_ids = list(df.index)
+        self.labels = [
+            "  ".join(map(str, row))
+            for row in schema.format_frame(df[columns]).fillna("").values.tolist()
+        ]
+        self.positions = {row_id: i for i, row_id in enumerate(self.row_ids)}
+        self.haystacks = [label.lower() for label in self.labels]
+        self.last_query = None
+        self.last_matches = []  # Positions matching last_query, in index order
+
+    def label(self, row_id: int) -> str:
+        """
+        @return: Display label of the entry with row id
+        """
+        return self.labels[self.positions[row_id]]
+
+    def search(self, query: str, limit: int = None) -> list[int]:
+        """
+        @param query: Search query, whitespace is ignored
+        @param limit: Maximum number of results
+        @return: Row ids of matching entries, best match first
+        """
+        query = "".join(query.lower().split())
+        if self.last_query is not None and query.startswith(self.last_query):
+            candidates = self.last_matches  # Refinement can only narrow matches
+        else:
+            candidates = range(len(self.haystacks))
+        pattern = re.compile(".*?".join(map(re.escape, query)))
+        scored = []
+        for i in candidates:
+            match = pattern.search(self.haystacks[i])
+            if match:
+                scored.append((match.end() - match.start(), match.start(), i))
+        self.last_query = query
+        self.last_matches = [i for _, _, i in scored]
+        scored.sort()
+        return [self.row_ids[i] for _, _, i in scored[:limit]]
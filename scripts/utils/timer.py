@@ -0,0 +1,74 @@
+import constants
+import contextlib
+import threading
+import time
+
+
+class PhaseTimer:
+    """
+    Thread safe wall-clock timer for named phases. Each phase can carry a
+    baseline (the fixed cost it replaced) so the report shows time saved.
+
+    Example usage:
+    timer = PhaseTimer()
+    with timer.phase("page_ready", baseline=constants.SELENIUM_TIMEOUT):
+        wait_for_page()
+    print(timer.report())
+    """
+
+    def __init__(self):
+        self.phases = {}  # name -> [runs, total seconds, baseline seconds]
+        self.lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def phase(self, name: str, baseline: float = None):
+        """
+        Time the wrapped block as one run of a phase.
+
+        @param name: Name of the phase
+        @param baseline: Seconds the phase used to cost, if it replaced a fixed wait
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start, baseline)
+
+    def record(self, name: str, elapsed: float, baseline: float = None) -> None:
+        """
+        Record a single run of a phase.
+
+        @param name: Name of the phase
+        @param elapsed: Seconds spent in the phase
+        @param baseline: Seconds the phase used to cost (defaults to elapsed)
+        """
+        with self.lock:
+            runs, total, base = self.phases.get(name, [0, 0.0, 0.0])
+            self.phases[name] = [
+                runs + 1,
+                total + elapsed,
+                base + (baseline if baseline is not None else elapsed),
+            ]
+
+    def report(self, urls: int = None) -> str:
+        """
+        @param urls: Number of URLs in the batch, adds a per URL column if given
+        @return: Table of runs, mean time, time per URL and time saved per phase
+        """
+        with self.lock:
+            phases = dict(self.phases)
+        per_url = f"{'Per URL (ms)':>14}" if urls else ""
+        lines = [
+            f"{'Phase':<12}{'Runs':>6}{'Mean (s)':>10}{'Total (s)':>11}{per_url}{'Saved (s)':>11}"
+        ]
+        for name, (runs, total, base) in phases.items():
+            per_url = f"{total / urls * 1000:>14.1f}" if urls else ""
+            lines.append(
+                f"{name:<12}{runs:>6}{total / runs:>10.2f}{total:>11.2f}{per_url}{base - total:>11.2f}"
+            )
+        if urls:
+            total = sum(total for _, total, _ in phases.values())
+            lines.append(f"Total per URL: {total / urls * 1000:.1f}ms over {urls} URL(s)")
+        saved = sum(base - total for _, total, base in phases.values())
+        lines.append(f"{constants.OKGREEN}Total wall-clock saved: {saved:.2f}s{constants.ENDC}")
+        return "\n".join(lines)
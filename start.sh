@@ -183,11 +183,30 @@ OPTIONS:
     -h, --help
         Print help and exit
 
+COMMANDS:
+    add --company <name> --position <title> --link <url> [--date --status --notes]
+        Add a job application without prompts
+
+    auto --urls-file <file|-> [--retries <n>] [--engine thread|async]
+        Generate job applications from job posting URLs without prompts
+
+    export [--format csv|tsv|json] [--output <file>]
+        Export job applications
+
+    stats
+        Show application stats
+
+    daemon [--stop | --status]
+        Run the scrape daemon in the foreground. While it runs, auto reuses its
+        browser drivers, display and coordination service
+
 EOF
 }
 
 clean() {
     echo "Cleaning up..."
+    echo "Stopping shared virtual display..."
+    $TRAPP_HOME/env/bin/python3 -c "import sys; sys.path.append('$TRAPP_HOME'); from scripts.services.display import SharedDisplay; SharedDisplay().shutdown()" 2>/dev/null
     echo -e "Removing .cache\nRemoving pid\nRemoving logs\nRemoving TRAPP-DAEMON.pid\nRemoving bkp.out"
     rip $TRAPP_HOME/.cache $TRAPP_HOME/bkp/pid $TRAPP_HOME/bkp/logs $TRAPP_HOME/bkp/bkp.out bkp 2>/dev/null
     echo "Removing preview files..."
@@ -366,6 +385,11 @@ ARGFLAG=0
 # for arg in "$@"; do
 while [[ $# -gt 0 ]]; do
     case $1 in
+    add | auto | export | stats | daemon)
+        # Non-interactive commands, see runner.py --help
+        $TRAPP_HOME/env/bin/python3 $TRAPP_HOME/runner.py "$@"
+        exit $?
+        ;;
     -b | --wbkp)
         echo "Running program with backup option..."
         $TRAPP_HOME/env/bin/python3 $TRAPP_HOME/runner.py wbkp
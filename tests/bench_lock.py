@@ -0,0 +1,153 @@
+"""
+Benchmark lock contention: workers repeatedly take the same platform lock.
+
+Usage: python tests/bench_lock.py [workers] [rounds]
+
+Reports acquire latency, throughput, client CPU time and Redis commands
+per second for the lock of each coordination backend, and for the SETNX
+spin loop ScraperEngine.run used before the lease lock. Redis is reached at REDIS_HOST:REDIS_PORT with
+$REDIS_TRAPP_PWD. When it is not reachable, the Redis rows run against
+fakeredis if it is installed.
+"""
+import os
+import statistics
+import sys
+import threading
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+import constants
+import redis
+
+from scripts.services.redis.local import LocalClient
+from scripts.services.redis.lock import Lock, LocalLock
+from scripts.services.redis.redis import RedisService
+
+NAME = "LinkedIn"
+HOLD = 0.001  # Seconds a worker holds the lock, e.g. an auth state check
+
+
+class SpinLock:
+    """
+    The SETNX loop the lease lock replaced, without sleep, backoff or TTL
+    """
+
+    def __init__(self, client: redis.StrictRedis, name: str):
+        self.client = client
+        self.name = Lock.uuid(name)
+
+    def __enter__(self) -> "SpinLock":
+        while not self.client.setnx(self.name, 1):
+            pass
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.client.delete(self.name)
+
+
+def redis_client() -> tuple[str, redis.StrictRedis]:
+    """
+    @return: Name of the Redis server and a client, or (None, None) if there is none
+    """
+    service = RedisService(
+        password=os.getenv("REDIS_TRAPP_PWD", constants.REDIS_TEST_PWD)
+    )
+    if service.status():
+        return "redis", service.connect()
+    try:
+        import fakeredis
+    except ImportError:
+        return None, None
+    return "fakeredis", fakeredis.FakeStrictRedis(decode_responses=True)
+
+
+def count_commands(client: redis.StrictRedis) -> list[int]:
+    """
+    Count the commands client sends to Redis
+
+    @return: Single item list holding the running count
+    """
+    count = [0]
+    execute_command = client.execute_command
+
+    def counted(*args, **kwargs):
+        count[0] += 1  # Unlocked, close enough for a rate
+        return execute_command(*args, **kwargs)
+
+    client.execute_command = counted
+    return count
+
+
+def bench(make_lock, workers: int, rounds: int, commands: list[int] = None) -> dict:
+    """
+    @param make_lock: Function returning a new lock on the shared resource
+    @param workers: Number of threads contending for the lock
+    @param rounds: Times each worker takes the lock
+    @param commands: Running count of Redis commands, see count_commands()
+    @return: Acquire latencies, wall-clock and CPU seconds, and Redis commands sent
+    """
+    latencies = []
+    latencies_lock = threading.Lock()
+    barrier = threading.Barrier(workers)
+
+    def worker():
+        timings = []
+        barrier.wait()
+        for _ in range(rounds):
+            start = time.perf_counter()
+            with make_lock():
+                timings.append(time.perf_counter() - start)
+                time.sleep(HOLD)
+        with latencies_lock:
+            latencies.extend(timings)
+
+    threads = [threading.Thread(target=worker) for _ in range(workers)]
+    sent = commands[0] if commands is not None else None
+    start, cpu = time.perf_counter(), time.process_time()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed, cpu = time.perf_counter() - start, time.process_time() - cpu
+    if commands is not None:
+        sent = commands[0] - sent
+    return {"latencies": latencies, "elapsed": elapsed, "cpu": cpu, "commands": sent}
+
+
+def report(name: str, result: dict) -> None:
+    latencies = sorted(result["latencies"])
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    ops = (
+        f"{result['commands'] / result['elapsed']:>12.0f}"
+        if result["commands"] is not None
+        else f"{'n/a':>12}"
+    )
+    print(
+        f"{name:<22}{statistics.mean(latencies) * 1000:>10.2f}{p95 * 1000:>10.2f}"
+        + f"{len(latencies) / result['elapsed']:>10.0f}{result['cpu']:>9.2f}{ops}"
+    )
+
+
+if __name__ == "__main__":
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    print(f"{workers} worker(s) x {rounds} round(s), lock held {HOLD * 1000:.0f}ms")
+    print(
+        f"{'Lock':<22}{'Mean (ms)':>10}{'P95 (ms)':>10}{'Acq/s':>10}{'CPU (s)':>9}{'Redis ops/s':>12}"
+    )
+    local = LocalClient()
+    report("local", bench(lambda: LocalLock(client=local, name=NAME), workers, rounds))
+    server, client = redis_client()
+    if client is None:
+        print("redis                 not reachable, and fakeredis is not installed")
+    else:
+        commands = count_commands(client)
+        report(
+            f"{server} lease",
+            bench(lambda: Lock(client=client, name=NAME), workers, rounds, commands),
+        )
+        report(
+            f"{server} SETNX spin",
+            bench(lambda: SpinLock(client=client, name=NAME), workers, rounds, commands),
+        )
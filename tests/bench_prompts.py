@@ -0,0 +1,57 @@
+"""
+Benchmark prompt round-trip latency of each Gum backend.
+
+Usage: python tests/bench_prompts.py [rounds]
+
+The rich backend answers from an in-memory stream. The gum backend needs a
+terminal to answer from, so it is timed with --select-if-one, which returns
+as soon as the gum process is up.
+"""
+import io
+import os
+import shutil
+import statistics
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+import constants
+
+from scripts.utils.gum import GumPrompt, RichPrompt
+
+OPTS = ["YES", "NO"]
+
+
+def bench(prompt, rounds: int) -> list[float]:
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        prompt()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def report(name: str, timings: list[float]) -> None:
+    print(
+        f"{name:<8}{statistics.mean(timings) * 1000:>10.2f}"
+        + f"{statistics.median(timings) * 1000:>12.2f}"
+        + f"{max(timings) * 1000:>10.2f}"
+    )
+
+
+if __name__ == "__main__":
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    print(f"{'Backend':<8}{'Mean (ms)':>10}{'Median (ms)':>12}{'Max (ms)':>10}")
+    with open(os.devnull, "w") as devnull:
+        stdout, sys.stdout = sys.stdout, devnull
+        rich = RichPrompt(stream=io.StringIO("1\n" * rounds))
+        rich.console.file = devnull
+        rich_timings = bench(lambda: rich.choose(OPTS), rounds)
+        sys.stdout = stdout
+    report("rich", rich_timings)
+    if shutil.which(constants.GUM_PATH):
+        gum = GumPrompt()
+        report("gum", bench(lambda: gum.choose(["--select-if-one", "YES"]), rounds))
+    else:
+        print(f"gum      not installed ({constants.GUM_PATH} not on PATH)")
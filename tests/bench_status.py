@@ -0,0 +1,85 @@
+"""
+Benchmark the per URL cost of the Redis health check in connect().
+
+Usage: python tests/bench_status.py [urls]
+
+AutoService.run connects to the coordination service once per URL, and
+every connect() checks that Redis is up. "before" is the check it used to
+run, a docker inspect shell whose output goes through a temp file. "after"
+is RedisService.status(), a PING cached for REDIS_STATUS_TTL seconds. The
+PING goes to a live Redis when one answers, otherwise to fakeredis if it
+is installed. Without docker, "before" still pays for the shell and the
+temp file.
+"""
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+import constants
+
+from scripts.services.redis.redis import RedisService
+
+
+def inspect_status(tmp_dir: str) -> bool:
+    """
+    The health check connect() ran before RedisService.status() was cached
+    """
+    filename = f"{tmp_dir}/redis_status.tmp_{uuid.uuid4()}"
+    with open(filename, "w") as log:
+        subprocess.call(
+            "docker inspect -f '{{.State.Running}}' "
+            + f"{constants.REDIS_CONTAINER_NAME}",
+            stdout=log,
+            stderr=log,
+            shell=True,
+        )
+    with open(filename, "r") as log:
+        status = log.read().strip()
+    os.remove(filename)
+    return status == "true"
+
+
+def bench(check, urls: int) -> list[float]:
+    timings = []
+    for _ in range(urls):
+        start = time.perf_counter()
+        check()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def report(name: str, timings: list[float]) -> None:
+    print(
+        f"{name:<8}{statistics.mean(timings) * 1000:>14.3f}"
+        + f"{statistics.median(timings) * 1000:>12.3f}"
+        + f"{max(timings) * 1000:>10.3f}{sum(timings):>11.3f}"
+    )
+
+
+if __name__ == "__main__":
+    urls = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    service = RedisService(
+        password=os.getenv("REDIS_TRAPP_PWD", constants.REDIS_TEST_PWD)
+    )
+    server = "redis"
+    if not service.status(refresh=True):
+        try:
+            import fakeredis
+        except ImportError:
+            sys.exit("Redis is not reachable, and fakeredis is not installed")
+        service.health_client = fakeredis.FakeStrictRedis(decode_responses=True)
+        server = "fakeredis"
+    docker = "docker" if shutil.which("docker") else "no docker"
+    print(f"{urls} URL(s), PING against {server}, inspect with {docker}")
+    print(f"{'Check':<8}{'Per URL (ms)':>14}{'Median (ms)':>12}{'Max (ms)':>10}{'Total (s)':>11}")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        report("before", bench(lambda: inspect_status(tmp_dir), urls))
+    service.invalidate()
+    report("after", bench(service.status, urls))
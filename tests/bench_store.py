@@ -0,0 +1,143 @@
+"""
+Benchmark job application stores on large histories.
+
+Usage: python tests/bench_store.py [rows ...]
+
+For each history size (10k and 100k rows by default, pass 1000000 for 1M),
+times opening and loading the store, appending one application, updating
+one, and finding applications by company, for:
+
+    csv       the pandas read_csv/to_csv calls runner.py made before the stores
+    columnar  ColumnarStore, a snapshot plus change log
+    sqlite    SqliteStore
+
+The first open of columnar and sqlite imports the CSV and is reported as
+"import". The fuzzy search index used by edit() is timed on the loaded
+table as well. Everything runs in a temporary directory.
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+import constants
+import pandas as pd
+
+from conftest import STORES, application, build_store, rows
+from scripts.models import schema
+from scripts.utils.search import FuzzyIndex
+
+COMPANIES = [f"Company {n}" for n in range(2000)]
+POSITIONS = ["Software Engineer", "Data Scientist", "Product Manager", "SRE", "Intern"]
+STATUSES = ["Applied", "Assessment", "Interview", "Offer", "Rejected"]
+
+
+def history(size: int) -> pd.DataFrame:
+    """
+    @return: Synthetic job applications with raw string values
+    """
+    r = random.Random(size)
+    return pd.DataFrame(
+        {
+            "Company": [r.choice(COMPANIES) for _ in range(size)],
+            "Position": [r.choice(POSITIONS) for _ in range(size)],
+            "Date Applied": [
+                f"{r.randint(1, 12):02d}/{r.randint(1, 28):02d}/{r.randint(2019, 2024)}"
+                for _ in range(size)
+            ],
+            "Status": [r.choice(STATUSES) for _ in range(size)],
+            "Portal Link": [f"https://jobs.com/{n}" for n in range(size)],
+            "Notes": ["" for _ in range(size)],
+        },
+        columns=constants.COLUMN_NAMES,
+    )
+
+
+def timed(f) -> tuple[float, any]:
+    start = time.perf_counter()
+    result = f()
+    return time.perf_counter() - start, result
+
+
+def new_application() -> pd.DataFrame:
+    return rows(
+        application(company="Company 1", position="SRE", link="https://jobs.com/new")
+    )
+
+
+def bench_csv(csv_path: str) -> dict:
+    timings = {}
+    timings["load"], df = timed(lambda: pd.read_csv(csv_path))
+    timings["append"], _ = timed(
+        lambda: new_application().to_csv(csv_path, mode="a", header=False, index=False)
+    )
+
+    def update():
+        df = pd.read_csv(csv_path)
+        df.loc[0, "Status"] = "Interview"
+        df.to_csv(csv_path, index=False)
+
+    timings["update"], _ = timed(update)
+    timings["find"], _ = timed(
+        lambda: pd.read_csv(csv_path).loc[lambda df: df["Company"] == "Company 1"]
+    )
+    return timings
+
+
+def bench_store(build) -> dict:
+    timings = {}
+    timings["import"], _ = timed(lambda: build().load())
+    store = build()
+    timings["load"], df = timed(store.load)
+    timings["append"], _ = timed(lambda: store.append(new_application()))
+    row_id = df.index[0]
+    timings["update"], _ = timed(lambda: store.update(row_id, {"Status": "Interview"}))
+    timings["find"], _ = timed(lambda: store.find("Company", "Company 1"))
+    return timings
+
+
+def report(name: str, size: int, timings: dict) -> None:
+    columns = ["import", "load", "append", "update", "find"]
+    print(
+        f"{name:<10}{size:>9}"
+        + "".join(
+            f"{timings[c] * 1000:>10.1f}" if c in timings else f"{'-':>10}"
+            for c in columns
+        )
+    )
+
+
+if __name__ == "__main__":
+    sizes = [int(n) for n in sys.argv[1:]] or [10_000, 100_000]
+    print(
+        f"{'Store':<10}{'Rows':>9}{'Import':>10}{'Load':>10}{'Append':>10}"
+        + f"{'Update':>10}{'Find':>10}   (ms)"
+    )
+    for size in sizes:
+        df = history(size)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            csv_path = f"{tmp_dir}/job_applications.csv"
+            df.to_csv(csv_path, index=False)
+            report("csv", size, bench_csv(csv_path))
+
+        for name in STORES:
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                df.to_csv(f"{tmp_dir}/job_applications.csv", index=False)
+                stdout, sys.stdout = sys.stdout, open(os.devnull, "w")
+                try:
+                    timings = bench_store(lambda: build_store(name, tmp_dir))
+                finally:
+                    sys.stdout.close()
+                    sys.stdout = stdout
+                report(name, size, timings)
+
+        typed = schema.apply(df)  # As loaded by a store
+        built, index = timed(lambda: FuzzyIndex(typed))
+        searched, _ = timed(lambda: index.search("comp 1 sre", limit=constants.SEARCH_LIMIT))
+        print(
+            f"{'fuzzy':<10}{size:>9}   index {built * 1000:.1f}ms, "
+            + f"search {searched * 1000:.1f}ms"
+        )
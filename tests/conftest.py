@@ -0,0 +1,104 @@
+"""
+Helpers and fixtures shared by the tests and benchmarks. Tests that use
+the store fixtures run once per storage backend, unless their module
+overrides the backend fixture.
+"""
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+import constants
+
+from scripts.services.stores.columnar import ColumnarStore
+from scripts.services.stores.sqlite import SqliteStore
+
+HEADER = ",".join(constants.COLUMN_NAMES)
+
+# Backend -> store with all of its files under a directory
+STORES = {
+    "columnar": lambda directory: ColumnarStore(
+        snapshot_path=f"{directory}/store.pkl",
+        log_path=f"{directory}/store.log",
+        csv_path=f"{directory}/job_applications.csv",
+        lock_path=f"{directory}/store.lock",
+        sort_index_path=f"{directory}/store.idx",
+    ),
+    "sqlite": lambda directory: SqliteStore(
+        db_path=f"{directory}/store.db",
+        csv_path=f"{directory}/job_applications.csv",
+    ),
+}
+
+
+def rows(*values: tuple) -> pd.DataFrame:
+    """
+    @return: Raw job applications, one row per values tuple
+    """
+    return pd.DataFrame(list(values), columns=constants.COLUMN_NAMES)
+
+
+def application(
+    n: int = 0,
+    company: str = None,
+    position: str = "SWE",
+    date: str = "01/05/2024",
+    status: str = "Applied",
+    link: str = None,
+    notes: str = "",
+) -> tuple:
+    """
+    @return: Raw values of the n-th test application, in COLUMN_NAMES order
+    """
+    return (
+        f"Company {n}" if company is None else company,
+        position,
+        date,
+        status,
+        f"https://jobs.com/{n}" if link is None else link,
+        notes,
+    )
+
+
+def build_store(backend: str, directory: str):
+    """
+    @return: Store for backend with its files under directory, not yet opened
+    """
+    return STORES[backend](directory)
+
+
+def read_csv(path: str) -> list[str]:
+    """
+    @return: Lines of the CSV file at path
+    """
+    with open(path) as f:
+        return f.read().splitlines()
+
+
+@pytest.fixture(params=STORES)
+def backend(request) -> str:
+    return request.param
+
+
+@pytest.fixture
+def reopen(backend, tmp_path):
+    """
+    @return: Function opening another store on the same files, as a second
+        trapp process would
+    """
+    return lambda: build_store(backend, tmp_path)
+
+
+@pytest.fixture
+def store(reopen):
+    store = reopen()
+    store.init()
+    return store
+
+
+@pytest.fixture
+def csv_path(tmp_path) -> str:
+    return str(tmp_path / "job_applications.csv")
@@ -0,0 +1,143 @@
+import multiprocessing
+import os
+
+import pytest
+
+import constants
+
+from conftest import HEADER, application, build_store, read_csv, rows
+from scripts.utils.errors import StoreConflictError
+
+
+@pytest.fixture
+def backend() -> str:
+    return "columnar"
+
+
+def line(values: tuple) -> str:
+    return ",".join(values)
+
+
+def test_log_replay(store, reopen):
+    store.append(rows(application(0), application(1)))
+    store.update(1, {"Status": "Interview"})
+    store.delete(0)
+    reopened = reopen().load()
+    assert reopened.index.tolist() == [1]
+    assert reopened.loc[1, "Status"] == "Interview"
+    assert reopened.loc[1, "Company"] == "Company 1"
+
+
+def test_compaction(store, reopen, csv_path, monkeypatch):
+    monkeypatch.setattr(constants, "STORE_COMPACT_THRESHOLD", 2)
+    for n in range(3):
+        store.append(rows(application(n)))
+    # The first two writes fill the log and are folded into the snapshot,
+    # which exports them
+    assert store.log_records == 1
+    assert read_csv(csv_path)[1:] == [line(application(n)) for n in range(2)]
+    reopened = reopen()
+    assert reopened.load()["Company"].tolist() == [f"Company {n}" for n in range(3)]
+    assert reopened.log_records == 1
+
+
+def test_csv_export_on_flush(store, reopen, csv_path):
+    store.append(rows(application(0)))
+    # Writes only touch the change log
+    assert read_csv(csv_path) == [HEADER]
+    store.flush()
+    assert read_csv(csv_path)[1:] == [line(application(0))]
+    store.update(0, {"Notes": "Referral"})
+    store.flush()
+    assert read_csv(csv_path)[1].endswith(",Referral")
+    store.delete(0)
+    store.flush()
+    assert read_csv(csv_path) == [HEADER]
+    # An exported store is not mistaken for an outside change
+    assert reopen().load().empty
+
+
+def test_csv_import(reopen, csv_path):
+    with open(csv_path, "w") as f:
+        f.write(f"{HEADER}\n{line(application(0))}\n")
+    store = reopen()
+    assert store.load()["Company"].tolist() == ["Company 0"]
+    store.append(rows(application(1)))
+    store.flush()
+    # Edited outside trapp, after the last export
+    with open(csv_path, "a") as f:
+        f.write(f"{line(application(2))}\n")
+    os.utime(csv_path, ns=(0, 0))
+    reopened = reopen().load()
+    assert reopened["Company"].tolist() == [f"Company {n}" for n in range(3)]
+
+
+def test_csv_import_leaves_file_as_is(reopen, csv_path):
+    content = f"{HEADER}\nA,SWE,1/5/2024,Applied,https://jobs.com/1,\n"
+    with open(csv_path, "w") as f:
+        f.write(content)
+    reopen().load()
+    with open(csv_path) as f:
+        assert f.read() == content
+
+
+def test_csv_conflict_keeps_both_sides(store, reopen, csv_path):
+    store.append(rows(application(0)))
+    # A writer crashed after logging a change, before exporting it
+    values = dict(zip(constants.COLUMN_NAMES, application(1)))
+    store.log({"op": "append", "rows": [{"id": 1, "values": values}]})
+    with open(csv_path, "a") as f:
+        f.write(f"{line(application(2))}\n")
+    os.utime(csv_path, ns=(0, 0))
+    with pytest.raises(StoreConflictError):
+        reopen().load()
+    # Neither side was overwritten
+    assert read_csv(csv_path)[-1] == line(application(2))
+    assert b"Company 1" in open(store.log_path, "rb").read()
+
+
+def test_pending_change_is_kept(store, reopen, csv_path):
+    store.append(rows(application(0)))
+    store.flush()
+    # A writer exited without flushing its change
+    values = dict(zip(constants.COLUMN_NAMES, application(1)))
+    store.log({"op": "append", "rows": [{"id": 1, "values": values}]})
+    reopened = reopen()
+    assert len(reopened.load().index) == 2
+    assert reopened.pending == 1
+    reopened.flush()
+    assert len(read_csv(csv_path)) == 3
+
+
+def test_torn_write_is_dropped(store, reopen):
+    store.append(rows(application(0)))
+    # A writer crashed halfway through a record
+    with open(store.log_path, "ab") as log:
+        log.write(b'{"op": "append", "rows": [{"id": 1, "val')
+    reopened = reopen()
+    assert reopened.load().index.tolist() == [0]
+    assert reopened.append(rows(application(1))) == [1]
+    assert reopen().load().index.tolist() == [0, 1]
+
+
+def append_applications(directory: str, worker: int) -> None:
+    store = build_store("columnar", directory)
+    for n in range(5):
+        store.append(rows(application(worker * 100 + n)))
+    store.flush()  # As trapp does on exit
+
+
+def test_concurrent_writers(store, reopen, csv_path, tmp_path):
+    workers = [
+        multiprocessing.Process(target=append_applications, args=(str(tmp_path), worker))
+        for worker in range(4)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+        assert worker.exitcode == 0
+    df = reopen().load()
+    assert df.index.tolist() == list(range(20))
+    assert df["Portal Link"].nunique() == 20
+    assert len(read_csv(csv_path)) == 21
@@ -0,0 +1,112 @@
+import datetime
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from scripts.models import entry, status
+from scripts.services.daemon import DaemonClient, TrappDaemon
+from scripts.utils.errors import (
+    DaemonError,
+    ServiceAlreadyRunningError,
+    ServiceNotRunningError,
+)
+
+
+class FakeService:
+    """
+    Stands in for AutoService: URLs containing "fail" fail, "crash" raises
+    """
+
+    def __init__(self):
+        self.jobs = []
+        self.torn_down = 0
+
+    def batch_run(self, urls: list[str], engine: str) -> tuple[list[entry.Entry], list[str]]:
+        self.jobs.append((urls, engine))
+        if any("crash" in url for url in urls):
+            raise RuntimeError("driver crashed")
+        return [
+            entry.Entry(
+                company="Acme",
+                position="SWE",
+                date_applied=datetime.datetime(2024, 1, 5),
+                status=status.Status.INIT,
+                link=url,
+                notes="",
+            )
+            for url in urls
+            if "fail" not in url
+        ], [url for url in urls if "fail" in url]
+
+    def teardown(self) -> None:
+        self.torn_down += 1
+
+
+@pytest.fixture
+def daemon(tmp_path):
+    """
+    TrappDaemon serving a FakeService from another thread
+    """
+    daemon = TrappDaemon(socket_path=str(tmp_path / "trapp.sock"), service=FakeService())
+    thread = threading.Thread(target=daemon.serve)
+    thread.start()
+    client = DaemonClient(daemon.socket_path)
+    for _ in range(100):
+        if client.available():
+            break
+        time.sleep(0.05)
+    daemon.thread = thread
+    yield daemon
+    if client.available():
+        client.shutdown()
+    thread.join(timeout=5)
+
+
+def test_round_trip(daemon):
+    client = DaemonClient(daemon.socket_path)
+    entries, failed = client.batch_run(
+        ["https://jobs.com/1", "https://jobs.com/fail"], engine="async"
+    )
+    assert [e.link for e in entries] == ["https://jobs.com/1"]
+    assert entries[0].status == status.Status.INIT
+    assert entries[0].date_applied == datetime.datetime(2024, 1, 5)
+    assert failed == ["https://jobs.com/fail"]
+    assert daemon.service.jobs == [
+        (["https://jobs.com/1", "https://jobs.com/fail"], "async")
+    ]
+
+
+def test_socket_is_private(daemon):
+    # Group and other users can't connect
+    assert os.stat(daemon.socket_path).st_mode & 0o077 == 0
+
+
+def test_job_error(daemon):
+    client = DaemonClient(daemon.socket_path)
+    with pytest.raises(DaemonError, match="driver crashed"):
+        client.batch_run(["https://jobs.com/crash"])
+    # The daemon keeps serving
+    assert client.batch_run(["https://jobs.com/2"])[1] == []
+
+
+def test_already_running(daemon):
+    with pytest.raises(ServiceAlreadyRunningError):
+        TrappDaemon(socket_path=daemon.socket_path, service=FakeService()).serve()
+
+
+def test_shutdown_tears_down_service(daemon):
+    service = daemon.service
+    DaemonClient(daemon.socket_path).shutdown()
+    daemon.thread.join(timeout=5)
+    assert not daemon.thread.is_alive()
+    assert service.torn_down == 1
+    assert not os.path.exists(daemon.socket_path)
+    client = DaemonClient(daemon.socket_path)
+    assert not client.available()
+    with pytest.raises(ServiceNotRunningError):
+        client.batch_run(["https://jobs.com/1"])
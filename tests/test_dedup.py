@@ -0,0 +1,111 @@
+import multiprocessing
+
+import pytest
+
+import constants
+
+from conftest import application, build_store, rows
+from scripts.utils.dedup import DedupIndex, entry_key, normalize_link
+
+
+@pytest.mark.parametrize(
+    "link",
+    [
+        "https://jobs.com/posting/1",
+        "http://www.jobs.com/posting/1/",
+        "HTTPS://Jobs.com/posting/1#apply",
+        "jobs.com/posting/1?utm_source=linkedin&ref=feed",
+        "  https://jobs.com/posting/1?trk=abc  ",
+    ],
+)
+def test_normalize_link(link):
+    assert normalize_link(link) == "jobs.com/posting/1"
+
+
+def test_normalize_link_keeps_meaningful_query():
+    assert normalize_link("https://jobs.com/view?b=2&id=7&utm_medium=x") == (
+        "jobs.com/view?b=2&id=7"
+    )
+    assert normalize_link("https://jobs.com/view?id=7") != normalize_link(
+        "https://jobs.com/view?id=8"
+    )
+    assert normalize_link("") is None
+    assert normalize_link(float("nan")) is None
+
+
+def test_entry_key():
+    assert entry_key("  Google ", "Software  Engineer") == entry_key(
+        "google", "SOFTWARE ENGINEER"
+    )
+    assert entry_key("Google", "") is None
+    assert entry_key(None, "SWE") is None
+
+
+def test_index_tracks_updates_and_deletes():
+    index = DedupIndex()
+    values = dict(
+        zip(
+            constants.COLUMN_NAMES,
+            application(company="Acme", position="SWE", link="https://a.com/1"),
+        )
+    )
+    index.add(0, values)
+    assert index.lookup({"Portal Link": "a.com/1/"}) == constants.DUPLICATE_LINK
+    assert index.lookup({"Company": "ACME", "Position": "swe"}) == constants.DUPLICATE_ENTRY
+    index.remove(0, values)
+    assert index.lookup(values) is None
+
+
+def test_duplicates_within_batch():
+    df = rows(
+        application(company="Acme", position="SWE", link="https://a.com/1"),
+        application(company="Acme", position="SWE", link="https://a.com/2"),
+        application(company="Other", position="PM", link="https://www.a.com/1"),
+        application(company="Other", position="SRE", link="https://a.com/3"),
+    )
+    assert DedupIndex().duplicates(df) == [
+        None,
+        constants.DUPLICATE_ENTRY,
+        constants.DUPLICATE_LINK,
+        None,
+    ]
+
+
+def append_batch(backend: str, directory: str, barrier: multiprocessing.Barrier) -> None:
+    store = build_store(backend, directory)
+    df = rows(*[application(n) for n in range(5)])
+    barrier.wait()
+    store.append_new(df)
+
+
+def test_append_new(store):
+    row_ids, reasons = store.append_new(
+        rows(
+            application(company="Acme", position="SWE", link="https://a.com/1"),
+            application(company="Acme", position="SWE", link="https://a.com/2"),
+        )
+    )
+    assert len(row_ids) == 1
+    assert reasons == [None, constants.DUPLICATE_ENTRY]
+    row_ids, reasons = store.append_new(
+        rows(application(company="Other", position="PM", link="a.com/1"))
+    )
+    assert row_ids == []
+    assert reasons == [constants.DUPLICATE_LINK]
+
+
+def test_append_new_across_processes(backend, store, reopen, tmp_path):
+    barrier = multiprocessing.Barrier(4)
+    workers = [
+        multiprocessing.Process(
+            target=append_batch, args=(backend, str(tmp_path), barrier)
+        )
+        for _ in range(4)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+        assert worker.exitcode == 0
+    # Every process tried to add the same five postings
+    assert reopen().count() == 5
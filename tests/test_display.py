@@ -0,0 +1,50 @@
+import os
+import socket
+import subprocess
+
+import pytest
+
+import constants
+
+from scripts.services.display import SharedDisplay
+
+
+@pytest.fixture
+def display(tmp_path, monkeypatch) -> SharedDisplay:
+    monkeypatch.setattr(constants, "X11_SOCKET_DIR", str(tmp_path))
+    return SharedDisplay(
+        state_path=str(tmp_path / "display.json"),
+        lock_path=str(tmp_path / "display.lock"),
+        keep_warm=False,
+    )
+
+
+@pytest.fixture
+def process():
+    """
+    Process standing in for Xvfb, or for whatever reused its pid
+    """
+    process = subprocess.Popen(["sleep", "30"])
+    yield process
+    process.kill()
+    process.wait()
+
+
+def test_stale_state_is_not_killed(display, process):
+    # Recorded before a reboot, the pid now belongs to another process
+    display.write_state({"display": ":5", "pid": process.pid, "clients": []})
+    assert not SharedDisplay.usable(display.read_state())
+    display.shutdown()
+    assert process.poll() is None
+    assert not os.path.exists(display.state_path)
+
+
+def test_live_display_is_stopped(display, process, tmp_path):
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as x11:
+        x11.bind(str(tmp_path / "X5"))
+        x11.listen()
+        display.write_state({"display": ":5", "pid": process.pid, "clients": []})
+        assert SharedDisplay.usable(display.read_state())
+        display.shutdown()
+    assert process.wait(timeout=5) is not None
+    assert not os.path.exists(display.state_path)
@@ -0,0 +1,95 @@
+import io
+
+import pandas as pd
+import pytest
+
+from conftest import HEADER, build_store, read_csv
+from scripts.models import schema
+
+CSV = (
+    f"{HEADER}\n"
+    + "Acme,SWE,01/05/2024,Applied,https://a.com/1,Referral\n"
+    + "Beta,PM,Jan 5th-ish,Ghosted,https://b.com/2,\n"
+    + "Gamma,SRE,,Interview,https://c.com/3,\n"
+)
+
+
+def read(content: str) -> pd.DataFrame:
+    return schema.read_csv(io.StringIO(content))
+
+
+def test_csv_round_trip():
+    df = read(CSV)
+    assert df["Date Applied"].tolist()[0] == pd.Timestamp("2024-01-05")
+    assert df["Status"].tolist() == ["Applied", "Ghosted", "Interview"]
+    out = io.StringIO()
+    schema.to_csv(df, out)
+    assert out.getvalue() == CSV
+
+
+def test_valid_dates_keep_datetime_dtype():
+    df = read(f"{HEADER}\nAcme,SWE,1/5/2024,Offer,https://a.com/1,\n")
+    assert pd.api.types.is_datetime64_any_dtype(df["Date Applied"])
+    assert isinstance(df["Status"].dtype, pd.CategoricalDtype)
+    # Entered in another format, written back in DATE_FORMAT
+    assert schema.format_frame(df)["Date Applied"].tolist() == ["01/05/2024"]
+
+
+def test_unknown_values_are_kept():
+    df = read(CSV)
+    # Known statuses keep their funnel order, extra ones follow
+    assert list(df["Status"].cat.categories)[-1] == "Ghosted"
+    assert df["Date Applied"].tolist()[1] == "Jan 5th-ish"
+    assert pd.isna(df["Date Applied"].tolist()[2])
+
+
+def test_format_values():
+    assert schema.format_values(
+        {"Date Applied": pd.NaT, "Status": float("nan"), "Notes": None}
+    ) == {"Date Applied": None, "Status": None, "Notes": None}
+    assert schema.format_values({"Date Applied": pd.Timestamp("2024-01-05")}) == {
+        "Date Applied": "01/05/2024"
+    }
+    assert schema.parse_values({"Date Applied": "Jan 5th-ish"}) == {
+        "Date Applied": "Jan 5th-ish"
+    }
+
+
+def test_check_values():
+    with pytest.raises(ValueError):
+        schema.check_values({"Salary": "100k"})
+    with pytest.raises(ValueError):
+        schema.check_values({"Status": ["Applied"]})
+
+
+def test_sort_with_dates_kept_as_entered(tmp_path):
+    store = build_store("columnar", tmp_path)
+    store.init()
+    store.append(read(CSV))
+    order = store.sort_index("Date Applied")
+    assert store.load().iloc[order]["Company"].tolist() == ["Acme", "Beta", "Gamma"]
+
+
+def test_store_keeps_values_as_entered(reopen, csv_path):
+    with open(csv_path, "w") as f:
+        f.write(CSV)
+    store = reopen()
+    row_ids = store.load().index.tolist()
+    # Free text typed in through "Other"
+    store.update(row_ids[0], {"Status": "Waitlisted", "Date Applied": "last week"})
+    store.append(read(f"{HEADER}\nDelta,SWE,01/09/2024,On hold,https://d.com/4,\n"))
+    store.flush()
+    df = reopen().load()
+    assert df["Status"].tolist() == ["Waitlisted", "Ghosted", "Interview", "On hold"]
+    assert df["Date Applied"].tolist()[:2] == ["last week", "Jan 5th-ish"]
+    lines = read_csv(csv_path)
+    assert lines[1] == "Acme,SWE,last week,Waitlisted,https://a.com/1,Referral"
+    assert lines[2:4] == CSV.splitlines()[2:4]
+
+
+def test_store_rejects_bad_update(store, reopen):
+    row_ids = store.append(read(CSV))
+    with pytest.raises(ValueError):
+        store.update(row_ids[0], {"Salary": "100k"})
+    # Nothing was logged, so the store still opens
+    assert reopen().count() == 3
@@ -0,0 +1,59 @@
+import pandas as pd
+
+from conftest import application, rows
+from scripts.models import schema
+from scripts.utils.search import FuzzyIndex
+
+
+def entries(*values: tuple, index: list[int] = None) -> pd.DataFrame:
+    """
+    @return: Typed job entries, indexed by row id
+    """
+    df = rows(*values)
+    df.index = pd.Index(index or range(len(values)), name="id")
+    return schema.apply(df)
+
+
+def test_tightest_match_first():
+    index = FuzzyIndex(
+        entries(
+            # g, o spread across the label
+            application(company="Gusto", position="Operations Lead"),
+            application(company="Google", position="Software Engineer"),
+            application(company="Goldman Sachs", position="Analyst"),
+        )
+    )
+    assert index.search("goog") == [1]
+    assert index.search("go")[:2] == [1, 2]
+
+
+def test_returns_row_ids():
+    index = FuzzyIndex(
+        entries(
+            application(company="Stripe"), application(company="Square"), index=[40, 7]
+        )
+    )
+    assert index.search("square") == [7]
+    assert index.label(7).startswith("Square  SWE  01/05/2024")
+
+
+def test_whitespace_and_case_are_ignored():
+    index = FuzzyIndex(entries(application(company="Meta", position="Software Engineer")))
+    assert index.search("META soft  eng") == [0]
+
+
+def test_refinement_narrows_matches():
+    index = FuzzyIndex(entries(*[application(n) for n in range(20)]))
+    # Every label has a 1 in its date, but adjacent matches rank first
+    assert sorted(index.search("company 1")[:11]) == [1, *range(10, 20)]
+    matches = set(index.search("company 1"))
+    assert index.search("company 12")[0] == 12
+    assert set(index.search("company 12")) <= matches
+    # Editing the query back rescans every entry
+    assert len(index.search("company")) == 20
+
+
+def test_limit_and_no_match():
+    index = FuzzyIndex(entries(*[application(n) for n in range(20)]))
+    assert len(index.search("company", limit=5)) == 5
+    assert index.search("zzz") == []
@@ -0,0 +1,84 @@
+import os
+import sqlite3
+
+import pytest
+
+import constants
+
+from conftest import HEADER, application, read_csv, rows
+from scripts.models.stats import Stats
+
+
+@pytest.fixture
+def backend() -> str:
+    return "sqlite"
+
+
+def role(n: int, status: str = "Applied") -> tuple:
+    """
+    @return: Application n, at one of three companies
+    """
+    return application(n, company=f"Company {n % 3}", position=f"Role {n}", status=status)
+
+
+def stored_stats(store) -> dict:
+    return store.stats().counts
+
+
+def rebuilt_stats(store) -> dict:
+    return Stats.build(store.load()).counts
+
+
+def test_csv_migration(reopen, csv_path):
+    content = f"{HEADER}\n" + "".join(f"{','.join(role(n))}\n" for n in range(3))
+    with open(csv_path, "w") as f:
+        f.write(content)
+    store = reopen()
+    df = store.load()
+    assert df["Position"].tolist() == ["Role 0", "Role 1", "Role 2"]
+    assert store.find("Company", "Company 1")["Position"].tolist() == ["Role 1"]
+    # Migrating reads the CSV without rewriting it
+    with open(csv_path) as f:
+        assert f.read() == content
+    # Only the first open migrates
+    assert reopen().count() == 3
+
+
+def test_index_backfill(store, reopen):
+    store.append(rows(role(0), role(1)))
+    # A database written before application_keys and application_stats existed
+    with sqlite3.connect(store.db_path) as connection:
+        connection.execute("DELETE FROM application_keys")
+        connection.execute("DELETE FROM application_stats")
+        connection.execute("PRAGMA user_version = 0")
+    reopened = reopen()
+    assert stored_stats(reopened) == rebuilt_stats(reopened)
+    assert reopened.duplicates(rows(role(1))) == [constants.DUPLICATE_LINK]
+
+
+def test_stats_in_sync(store):
+    row_ids = store.append(rows(*[role(n) for n in range(6)]))
+    assert stored_stats(store) == rebuilt_stats(store)
+    store.update(row_ids[0], {"Status": "Interview"})
+    store.update(row_ids[1], {"Company": "Company 9", "Status": "Rejected"})
+    assert stored_stats(store) == rebuilt_stats(store)
+    store.delete(row_ids[2])
+    store.delete(row_ids[3])
+    assert stored_stats(store) == rebuilt_stats(store)
+    assert store.stats().total() == 4
+
+
+def test_csv_export_on_flush(store, reopen, csv_path):
+    row_ids = store.append(rows(role(0)))
+    store.update(row_ids[0], {"Notes": "Referral"})
+    # Writes don't touch the CSV
+    assert read_csv(csv_path) == [HEADER]
+    # Another process flushes writes it didn't make
+    reopen().flush()
+    assert read_csv(csv_path)[1].endswith(",Referral")
+    os.remove(csv_path)
+    store.flush()  # Nothing new to export
+    assert not os.path.exists(csv_path)
+    store.delete(row_ids[0])
+    store.flush()
+    assert read_csv(csv_path) == [HEADER]
@@ -0,0 +1,48 @@
+import os
+import re
+import subprocess
+import sys
+
+PROJECT_ROOT = os.path.join(os.path.dirname(__file__), "..")
+
+# Cumulative import time allowed for runner.py. Wall-clock time varies a lot
+# across machines and CI runners, so the default only catches gross
+# regressions, set TRAPP_IMPORT_BUDGET_MS to tighten it.
+IMPORT_BUDGET_MS = int(os.environ.get("TRAPP_IMPORT_BUDGET_MS", 1000))
+
+# Modules that must only load inside the menu actions that need them
+DEFERRED_MODULES = ["pandas", "numpy", "selenium", "redis", "bs4", "httpx", "rich"]
+
+
+def import_runner(*args: str, code: str = "") -> subprocess.CompletedProcess:
+    """
+    @return: Result of a fresh interpreter importing runner.py, then running code
+    """
+    return subprocess.run(
+        [sys.executable, *args, "-c", f"import runner\n{code}"],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        universal_newlines=True,
+        check=True,
+    )
+
+
+def test_heavy_modules_are_deferred():
+    loaded = import_runner(
+        code="import sys\nprint('\\n'.join(sys.modules))"
+    ).stdout.split()
+    for module in DEFERRED_MODULES:
+        assert module not in loaded, f"{module} is imported at startup"
+
+
+def test_import_time_budget():
+    timings = re.findall(
+        r"import time:\s+\d+ \|\s+(\d+) \| runner$",
+        import_runner("-X", "importtime").stderr,
+        re.M,
+    )
+    assert timings, "runner.py was not imported"
+    assert int(timings[-1]) < IMPORT_BUDGET_MS * 1000, (
+        f"runner.py took {int(timings[-1]) / 1000:.0f}ms to import, "
+        + f"budget is {IMPORT_BUDGET_MS}ms"
+    )
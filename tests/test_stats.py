@@ -0,0 +1,60 @@
+import constants
+
+from conftest import application, rows
+from scripts.models import schema
+from scripts.models.stats import Stats, keys
+
+
+def posting(n: int, status: str = "Applied", date: str = "01/05/2024") -> tuple:
+    """
+    @return: Application n, posted on LinkedIn by one of three companies
+    """
+    return application(
+        n,
+        company=f"Company {n % 3}",
+        position=f"Role {n}",
+        date=date,
+        status=status,
+        link=f"https://www.linkedin.com/jobs/{n}",
+    )
+
+
+def test_aggregates():
+    df = schema.apply(
+        rows(
+            posting(0),
+            posting(1, "Interview", "01/09/2024"),
+            posting(3, "Rejected"),
+        )
+    )
+    counts = Stats.build(df).counts
+    assert counts[("status", "Applied")] == [1, 0]
+    assert counts[("status", "Interview")] == [1, 1]
+    # 01/05/2024 was a Friday
+    assert counts[("week", "2024-01-01")] == [2, 1]
+    assert counts[("week", "2024-01-08")] == [1, 1]
+    assert counts[("company", "Company 0")] == [2, 1]
+    assert counts[("platform", constants.PLATFORM_MAP["linkedin"])] == [3, 2]
+
+
+def test_missing_status_is_not_a_response():
+    values = dict(zip(constants.COLUMN_NAMES, posting(0, status=None)))
+    for missing in [None, float("nan")]:
+        values["Status"] = missing
+        assert not any(responded for _, _, responded in keys(values))
+    stats = Stats.build(schema.apply(rows(posting(0, status=None))))
+    assert stats.total() == 0
+    assert stats.counts[("company", "Company 0")] == [1, 0]
+
+
+def test_aggregates_after_update_and_delete(store, reopen):
+    row_ids = store.append(rows(*[posting(n) for n in range(6)]))
+    store.update(row_ids[0], {"Status": "Interview"})
+    store.update(row_ids[1], {"Company": "Company 9", "Date Applied": "02/01/2024"})
+    store.update(row_ids[2], {"Status": None})
+    store.delete(row_ids[3])
+    assert store.stats().counts == Stats.build(store.load()).counts
+    assert store.stats().total() == 4
+    # Read back by another process
+    reopened = reopen()
+    assert reopened.stats().counts == Stats.build(reopened.load()).counts